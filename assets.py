@@ -53,13 +53,31 @@ class AssetTabBase(QtWidgets.QWidget):
         sc2 = QtGui.QShortcut(QtGui.QKeySequence(QtCore.Qt.Key_Enter),  self); sc2.activated.connect(self._emit_selected)
 
     def add_items(self, files: list[str]):
+        items: list[QtWidgets.QListWidgetItem] = []
+        cwd = None
         for f in files:
             if not f: continue
-            path = os.path.abspath(f)
+            # QFileDialog already yields absolute paths; only touch getcwd() for relative ones
+            if os.path.isabs(f):
+                path = os.path.normpath(f)
+            else:
+                if cwd is None: cwd = os.getcwd()
+                path = os.path.normpath(os.path.join(cwd, f))
             it = QtWidgets.QListWidgetItem(os.path.basename(path))
             it.setToolTip(path)
             it.setData(QtCore.Qt.UserRole, path)
-            self.list.addItem(it)
+            items.append(it)
+        if not items:
+            return
+        # one relayout/repaint for the whole import instead of one per row
+        self.list.setUpdatesEnabled(False)
+        self.list.blockSignals(True)
+        try:
+            for it in items:
+                self.list.addItem(it)
+        finally:
+            self.list.blockSignals(False)
+            self.list.setUpdatesEnabled(True)
 
     def _emit_selected(self):
         for it in self.list.selectedItems():
@@ -1,20 +1,66 @@
+import os
+from collections import OrderedDict
 import pygame
 
+# Small mixer buffer keeps SFX latency low; must run before any mixer.init().
+MIXER_FREQUENCY = 44100
+MIXER_BUFFER = 512
+_SFX_CACHE_MAX = 32
+
+try:
+    pygame.mixer.pre_init(MIXER_FREQUENCY, -16, 2, MIXER_BUFFER)
+    pygame.mixer.init()
+except Exception:
+    pass
+
 def ensure_audio():
+    if pygame.mixer.get_init():
+        return
     if not pygame.get_init():
         pygame.init()
-    if not pygame.mixer.get_init():
+    try:
+        pygame.mixer.init()
+    except Exception:
+        pass
+
+# Decoded SFX keyed by path (LRU, re-decoded when the file changes), so replays
+# skip disk read + decode
+_sfx_cache: OrderedDict[str, tuple[float, pygame.mixer.Sound]] = OrderedDict()
+
+def _get_sfx(path: str) -> pygame.mixer.Sound:
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        mtime = -1.0
+    hit = _sfx_cache.get(path)
+    if hit is not None and hit[0] == mtime:
+        _sfx_cache.move_to_end(path)
+        return hit[1]
+    s = pygame.mixer.Sound(path)
+    _sfx_cache[path] = (mtime, s)
+    _sfx_cache.move_to_end(path)
+    while len(_sfx_cache) > _SFX_CACHE_MAX:
+        _sfx_cache.popitem(last=False)  # channels still playing it keep their own reference
+    return s
+
+def preload_sfx(paths):
+    """Decode *paths* into the SFX cache ahead of playback."""
+    ensure_audio()
+    for path in paths:
+        if not path:
+            continue
         try:
-            pygame.mixer.init()
-        except Exception:
-            pass
+            _get_sfx(path)
+        except Exception as e:
+            print("[SFX] preload fail:", path, e)
 
 def play_sfx(path: str, volume: float = 1.0):
     ensure_audio()
     try:
-        s = pygame.mixer.Sound(path)
-        s.set_volume(max(0.0, min(1.0, volume)))
-        s.play()
+        # volume goes on the channel: the Sound is shared with earlier, still-playing hits
+        ch = _get_sfx(path).play()
+        if ch is not None:
+            ch.set_volume(max(0.0, min(1.0, volume)))
     except Exception as e:
         print("[SFX] fail:", e)
 
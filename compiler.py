@@ -1,57 +1,95 @@
 from __future__ import annotations
-import argparse
-import json
+import gzip
+import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from project_manager import is_compressed_project, load_project_json
+
+
+def _load_project_doc(path: Path) -> dict:
+    raw = path.read_bytes()
+    if is_compressed_project(path):
+        raw = gzip.decompress(raw)
+    return load_project_json(raw)
+
 
 def collect_assets(doc: dict) -> set[str]:
     assets: set[str] = set()
-    for track, items in (doc.get("tracks") or {}).items():
-        for entry in items or []:
-            data = entry.get("data", {})
-            for key in ("value", "background"):
-                val = data.get(key)
-                if isinstance(val, str) and val:
-                    assets.add(val)
-            if track == "MENU":
-                bg = data.get("background")
-                if isinstance(bg, str) and bg:
-                    assets.add(bg)
+    add = assets.add
+    for items in (doc.get("tracks") or {}).values():
+        for entry in items or ():
+            data = entry.get("data") or {}
+            val = data.get("value")
+            if val and isinstance(val, str):
+                add(val)
+            bg = data.get("background")
+            if bg and isinstance(bg, str):
+                add(bg)
     return assets
 
 
-def copy_assets(asset_root: Path, assets: set[str], dest: Path):
+def _is_up_to_date(src: Path, target: Path) -> bool:
+    """True when *target* already matches *src* by size and (whole-second) mtime."""
+    try:
+        ds = target.stat()
+        ss = src.stat()
+    except OSError:
+        return False
+    return ds.st_size == ss.st_size and int(ds.st_mtime) == int(ss.st_mtime)
+
+
+def copy_assets(asset_root: Path, assets: set[str], dest: Path) -> int:
+    """Copy *assets* under *dest*, skipping files already current there.
+
+    Returns the number of assets the build contains afterwards (copied or already up to date).
+    """
+    pairs: list[tuple[Path, Path]] = []
+    current = 0
     for rel in assets:
         src = (asset_root / rel).resolve()
         if not src.exists():
             continue
         target = dest / rel
-        target.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(src, target)
+        if _is_up_to_date(src, target):
+            current += 1
+            continue
+        pairs.append((src, target))
+    if not pairs:
+        return current
+    # create each destination folder once, before the workers start
+    for parent in {target.parent for _src, target in pairs}:
+        parent.mkdir(parents=True, exist_ok=True)
+    # copy2 releases the GIL during file I/O, so threads overlap the copies
+    workers = min(32, (os.cpu_count() or 1) * 4, len(pairs))
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        list(ex.map(lambda pair: shutil.copy2(*pair), pairs))
+    return current + len(pairs)
 
 
 def build_project(project_file: Path, platform: str, output: Path):
     project_file = project_file.resolve()
-    with open(project_file, "r", encoding="utf-8") as fh:
-        doc = json.load(fh)
+    doc = _load_project_doc(project_file)
 
     build_dir = output / platform
     assets_dir = build_dir / "assets"
     assets_dir.mkdir(parents=True, exist_ok=True)
 
-    copy_assets(project_file.parent, collect_assets(doc), assets_dir)
+    copied = copy_assets(project_file.parent, collect_assets(doc), assets_dir)
 
     shutil.copy2(project_file, build_dir / project_file.name)
     (build_dir / "README.txt").write_text(
-        f"Build for {platform}\\nProject: {project_file.name}\\nAssets copied: {len(list(assets_dir.rglob('*')))} files\\n",
+        f"Build for {platform}\\nProject: {project_file.name}\\nAssets copied: {copied} files\\n",
         encoding="utf-8",
     )
 
 
 def parse_args():
+    import argparse  # CLI-only; keeps `from compiler import build_project` light
+
     parser = argparse.ArgumentParser(description="Compile VNGEN project into runnable package.")
-    parser.add_argument("project", type=Path, help="Path to project JSON file")
+    parser.add_argument("project", type=Path, help="Path to project JSON (.json or gzip .vngenz) file")
     parser.add_argument("--platform", choices=["windows", "mac", "linux"], default="windows")
     parser.add_argument("--output", type=Path, default=Path("build"), help="Output directory root")
     return parser.parse_args()
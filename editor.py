@@ -1,10 +1,142 @@
 # editor.py — keyframe property editor (shows per-track fields)
 from __future__ import annotations
-from typing import Optional, Dict, Any, List
+import os
+from functools import partial
+from typing import Optional, Dict, Any, List, Tuple
 from pathlib import Path
 from PySide6 import QtCore, QtGui, QtWidgets
 from model import Keyframe
 from menu_palettes import MENU_PALETTES, DEFAULT_MENU_PALETTE
+from widgets_common import MenuOptionsModel, color_validator
+
+_MENU_HELP_TEXT = "Commands: jump <label|sec>; loop <label|sec>; pause; resume"
+_HELP_CSS = "color: #9aa; font-size: 11px;"
+_IMG_FILTER = "Images (*.png *.jpg *.jpeg *.bmp *.gif)"
+_AUD_FILTER = "Audio (*.wav *.mp3 *.ogg)"
+# name filter for each cached picker dialog (see KeyframeEditor._pick_file); menu backgrounds
+# get their own so pointing it at menus/ doesn't move the BG/sprite picker
+_FILE_FILTERS = {"image": _IMG_FILTER, "audio": _AUD_FILTER, "menu_image": _IMG_FILTER}
+
+
+def _set_plain_text(edit: QtWidgets.QPlainTextEdit, text: str):
+    # setPlainText rebuilds the whole document (and drops undo history); skip it on reselect
+    if edit.toPlainText() != text:
+        edit.setPlainText(text)
+
+
+# Read-then-write setters: reselecting a keyframe rewrites every field, and most are unchanged.
+def _set_text(edit: QtWidgets.QLineEdit, text: str):
+    if edit.text() != text:
+        edit.setText(text)
+
+
+def _set_value(spin: QtWidgets.QAbstractSpinBox, value):
+    if spin.value() != value:
+        spin.setValue(value)
+
+
+class _ChoiceCombo(QtWidgets.QComboBox):
+    """Fixed list of lower-case choices with an O(1) text -> index map."""
+
+    def __init__(self, choices, parent=None):
+        super().__init__(parent)
+        self.choices = tuple(choices)
+        self.index_of = {c: i for i, c in enumerate(self.choices)}
+        self.addItems(self.choices)
+
+    def set_choice(self, value: Any):
+        # unknown values leave the selection alone, like setCurrentText did
+        i = self.index_of.get(str(value).lower(), -1)
+        if i >= 0 and i != self.currentIndex():
+            self.setCurrentIndex(i)
+
+    def choice(self) -> str:
+        return self.choices[self.currentIndex()]
+
+
+# How a raw keyframe value gets into / out of each kind of field widget.
+_FIELD_IO = {
+    QtWidgets.QLineEdit: (lambda w, v: _set_text(w, str(v)), QtWidgets.QLineEdit.text),
+    QtWidgets.QPlainTextEdit: (lambda w, v: _set_plain_text(w, str(v)), QtWidgets.QPlainTextEdit.toPlainText),
+    QtWidgets.QDoubleSpinBox: (lambda w, v: _set_value(w, float(v)), QtWidgets.QDoubleSpinBox.value),
+    QtWidgets.QSpinBox: (lambda w, v: _set_value(w, int(v)), QtWidgets.QSpinBox.value),
+    _ChoiceCombo: (_ChoiceCombo.set_choice, _ChoiceCombo.choice),
+}
+
+# Widgets whose signals are held back while load() populates a page.
+_INPUT_TYPES = (QtWidgets.QLineEdit, QtWidgets.QPlainTextEdit, QtWidgets.QAbstractSpinBox,
+                QtWidgets.QComboBox, QtWidgets.QCheckBox)
+
+def _first(d: Dict[str, Any], keys, default: Any) -> Any:
+    """Value of the first key present in d (legacy aliases follow the current name)."""
+    for k in keys:
+        if k in d:
+            return d[k]
+    return default
+
+
+# Plain per-track fields: (data key, widget attr, default); coercion comes from _FIELD_IO.
+# A tuple key lists legacy aliases after the name that gets saved.
+# Anything with extra logic is handled in the matching _load_*/_save_*.
+_TRACK_SCHEMA: Dict[str, tuple] = {
+    "BG": (
+        ("value", "edBGPath", ""),
+        ("fit", "cbFit", "cover"),
+        ("align", "cbAlign", "center"),
+        ("zoom", "spZoom", 1.0),
+        (("duration", "xfade"), "spDurBG", 1.0),
+    ),
+    "SPRITE": (
+        ("value", "edSprPath", ""),
+        ("x", "spX", 0.5),
+        ("y", "spY", 0.6),
+        ("w", "spW", 0.26),
+        ("h", "spH", 0.45),
+        ("opacity", "spOp", 1.0),
+        ("duration", "spDurSPR", 1.0),
+    ),
+    "DIALOG": (
+        ("speaker", "edSpeaker", ""),
+        ("text", "edText", ""),
+        ("cps", "spCps", 24.0),
+        ("duration", "spDurDLG", 1.5),
+    ),
+    "SFX": (
+        ("value", "edSfxPath", ""),
+        ("vol", "spVolSfx", 1.0),
+    ),
+    "MUSIC": (
+        ("value", "edMusPath", ""),
+        ("vol", "spVolMus", 1.0),
+    ),
+    "FX": (
+        ("mode", "cbFXMode", "black"),
+        ("duration", "spFXDur", 1.0),
+        ("color", "edFXColor", "#000000"),
+        (("from_alpha", "from"), "spFrom", 0.0),
+        (("to_alpha", "to"), "spTo", 1.0),
+        ("amplitude", "spAmp", 16.0),
+        ("frequency", "spFreq", 12.0),
+        ("decay", "spDecay", 2.5),
+        ("seed", "spSeed", 0),
+    ),
+    "MENU": (
+        ("panel_opacity", "spMenuPanelOpacity", 0.85),
+        ("background", "edMenuBackground", ""),
+        ("background_opacity", "spMenuBackgroundOpacity", 0.3),
+    ),
+}
+
+# SPRITE animation targets: (data key, start widget attr, target widget attr);
+# a missing target defaults to the start value.
+_SPRITE_TARGETS = (
+    ("x2", "spX", "spX2"),
+    ("y2", "spY", "spY2"),
+    ("w2", "spW", "spW2"),
+    ("h2", "spH", "spH2"),
+    ("opacity2", "spOp", "spOp2"),
+)
+
 
 class KeyframeEditor(QtWidgets.QWidget):
     edited = QtCore.Signal(dict)  # {track, kf_id, t, data}
@@ -14,20 +146,80 @@ class KeyframeEditor(QtWidgets.QWidget):
         super().__init__(parent)
         self._track: Optional[str] = None
         self._kf: Optional[Keyframe] = None
-
-        self.setLayout(QtWidgets.QVBoxLayout())
-        self.layout().setContentsMargins(10, 10, 10, 10)
-        self.layout().setSpacing(8)
+        self._kf_t: Optional[float] = None
+        self._kf_data: Dict[str, Any] = {}
+        self._file_dialogs: Dict[str, QtWidgets.QFileDialog] = {}
+        self._cached_asset_root: Optional[Path] = None
+        self._menus_dir_made: Optional[Path] = None
+        self._page_inputs: Dict[str, Tuple[QtWidgets.QWidget, ...]] = {}
+        self._page_fields: Dict[str, tuple] = {}
+        self._menu_opts: Optional[List[dict]] = None  # _collect_menu_options result until the table changes
+
+        lay = QtWidgets.QVBoxLayout(self)
+        lay.setContentsMargins(10, 10, 10, 10)
+        lay.setSpacing(8)
 
         # header
         self.lblHeader = QtWidgets.QLabel("No selection")
-        self.layout().addWidget(self.lblHeader)
+        lay.addWidget(self.lblHeader)
 
         # stacked editor per track
         self.stack = QtWidgets.QStackedWidget()
-        self.layout().addWidget(self.stack, 1)
+        lay.addWidget(self.stack, 1)
+
+        # per-track pages are built on first use (see _page)
+        self._pages: Dict[str, QtWidgets.QWidget] = {}
+        self._builders = {
+            "BG": self._build_bg,
+            "SPRITE": self._build_sprite,
+            "DIALOG": self._build_dialog,
+            "SFX": self._build_sfx,
+            "MUSIC": self._build_music,
+            "FX": self._build_fx,
+            "MENU": self._build_menu,
+            "LOGIC": self._build_logic,
+        }
+        self._loaders = {
+            "BG": partial(self._load_fields, "BG"),
+            "SPRITE": self._load_sprite,
+            "DIALOG": partial(self._load_fields, "DIALOG"),
+            "SFX": partial(self._load_fields, "SFX"),
+            "MUSIC": partial(self._load_fields, "MUSIC"),
+            "FX": partial(self._load_fields, "FX"),
+            "MENU": self._load_menu,
+            "LOGIC": self._load_logic,
+        }
+        self._savers = {
+            "BG": partial(self._save_fields, "BG"),
+            "SPRITE": self._save_sprite,
+            "DIALOG": partial(self._save_fields, "DIALOG"),
+            "SFX": partial(self._save_fields, "SFX"),
+            "MUSIC": partial(self._save_fields, "MUSIC"),
+            "FX": partial(self._save_fields, "FX"),
+            "MENU": self._save_menu,
+            "LOGIC": self._save_logic,
+        }
+
+        # --- common: time + save button ---
+        self.spTime = _spin(0.0, 9999.0, 0.05, decimals=3, start=0.0)
+        rowBottom = QtWidgets.QHBoxLayout()
+        rowBottom.addWidget(QtWidgets.QLabel("Start (s):"))
+        rowBottom.addWidget(self.spTime, 1)
+        self.btnApply = QtWidgets.QPushButton("Apply")
+        rowBottom.addWidget(self.btnApply)
+        lay.addLayout(rowBottom)
+
+        self.btnApply.clicked.connect(self._emit_update)
+
+        # default page
+        self._showPage(None)
 
-        # --- BG editor (adds fit/align/zoom) ---
+    def _update_sprite_anim_fields(self, state: bool):
+        self._sprAnimBox.setEnabled(bool(state))
+
+    # ---------- page builders ----------
+    def _build_bg(self) -> QtWidgets.QWidget:
+        # BG editor (adds fit/align/zoom)
         self.pgBG = QtWidgets.QWidget()
         fbg = QtWidgets.QFormLayout(self.pgBG)
         fbg.setFieldGrowthPolicy(QtWidgets.QFormLayout.ExpandingFieldsGrow)
@@ -37,79 +229,87 @@ class KeyframeEditor(QtWidgets.QWidget):
         btnPickBG.setFixedWidth(28)
         rowBG = QtWidgets.QHBoxLayout()
         rowBG.addWidget(self.edBGPath, 1); rowBG.addWidget(btnPickBG)
-        fbg.addRow("Image", rowBG)
 
-        self.cbFit = QtWidgets.QComboBox()
-        self.cbFit.addItems(["cover", "contain", "stretch", "native"])
-        fbg.addRow("Fit", self.cbFit)
+        self.cbFit = _ChoiceCombo(["cover", "contain", "stretch", "native"])
 
-        self.cbAlign = QtWidgets.QComboBox()
-        self.cbAlign.addItems([
+        self.cbAlign = _ChoiceCombo([
             "center",
             "top", "bottom", "left", "right",
             "top-left", "top-right", "bottom-left", "bottom-right"
         ])
-        fbg.addRow("Align", self.cbAlign)
 
-        self.spZoom = QtWidgets.QDoubleSpinBox()
-        self.spZoom.setRange(0.05, 8.0)
-        self.spZoom.setSingleStep(0.05)
-        self.spZoom.setDecimals(2)
-        self.spZoom.setValue(1.0)
-        fbg.addRow("Zoom", self.spZoom)
+        self.spZoom = _spin(0.05, 8.0, 0.05, decimals=2, start=1.0)
+        self.spDurBG = _spin(0.05, 999.0, 1.0, decimals=2, start=1.0)
 
-        self.spDurBG = QtWidgets.QDoubleSpinBox()
-        self.spDurBG.setRange(0.05, 999.0); self.spDurBG.setDecimals(2); self.spDurBG.setValue(1.0)
-        fbg.addRow("Duration (s)", self.spDurBG)
+        for label, field in (
+            ("Image", rowBG), ("Fit", self.cbFit), ("Align", self.cbAlign),
+            ("Zoom", self.spZoom), ("Duration (s)", self.spDurBG),
+        ):
+            fbg.addRow(label, field)
 
-        self.stack.addWidget(self.pgBG)
         btnPickBG.clicked.connect(self._pick_bg)
+        return self.pgBG
 
-        # --- SPRITE editor ---
+    def _build_sprite(self) -> QtWidgets.QWidget:
+        # SPRITE editor
         self.pgSPR = QtWidgets.QWidget()
         fs = QtWidgets.QFormLayout(self.pgSPR)
         self.edSprPath = QtWidgets.QLineEdit()
         btnPickSpr = QtWidgets.QPushButton("…"); btnPickSpr.setFixedWidth(28)
         rowSP = QtWidgets.QHBoxLayout(); rowSP.addWidget(self.edSprPath, 1); rowSP.addWidget(btnPickSpr)
-        fs.addRow("Image", rowSP)
 
         self.spX = _spin(0.0, 1.0, 0.005); self.spY = _spin(0.0, 1.0, 0.005)
         self.spW = _spin(0.01, 1.0, 0.005); self.spH = _spin(0.01, 1.0, 0.005)
         self.spOp = _spin(0.0, 1.0, 0.05)
         self.spDurSPR = _spin(0.05, 999.0, 0.05, decimals=2, start=1.0)
 
-        fs.addRow("Center X", self.spX);  fs.addRow("Center Y", self.spY)
-        fs.addRow("Width", self.spW);     fs.addRow("Height", self.spH)
-        fs.addRow("Opacity", self.spOp);  fs.addRow("Duration (s)", self.spDurSPR)
+        for label, field in (
+            ("Image", rowSP),
+            ("Center X", self.spX), ("Center Y", self.spY),
+            ("Width", self.spW), ("Height", self.spH),
+            ("Opacity", self.spOp), ("Duration (s)", self.spDurSPR),
+        ):
+            fs.addRow(label, field)
 
         self.chkSprAnim = QtWidgets.QCheckBox("Animate to target values over this duration")
         fs.addRow(self.chkSprAnim)
+        # target fields share one container so toggling them is a single setEnabled
+        self._sprAnimBox = QtWidgets.QWidget()
+        fa = QtWidgets.QFormLayout(self._sprAnimBox)
+        fa.setContentsMargins(0, 0, 0, 0)
         self.spX2 = _spin(0.0, 1.0, 0.005); self.spY2 = _spin(0.0, 1.0, 0.005)
         self.spW2 = _spin(0.01, 1.0, 0.005); self.spH2 = _spin(0.01, 1.0, 0.005)
         self.spOp2 = _spin(0.0, 1.0, 0.05)
-        fs.addRow("Target Center X", self.spX2); fs.addRow("Target Center Y", self.spY2)
-        fs.addRow("Target Width", self.spW2);    fs.addRow("Target Height", self.spH2)
-        fs.addRow("Target Opacity", self.spOp2)
+        for label, field in (
+            ("Target Center X", self.spX2), ("Target Center Y", self.spY2),
+            ("Target Width", self.spW2), ("Target Height", self.spH2),
+            ("Target Opacity", self.spOp2),
+        ):
+            fa.addRow(label, field)
+        fs.addRow(self._sprAnimBox)
         self.chkSprAnim.toggled.connect(self._update_sprite_anim_fields)
         self._update_sprite_anim_fields(False)
 
-        self.stack.addWidget(self.pgSPR)
         btnPickSpr.clicked.connect(self._pick_sprite)
+        return self.pgSPR
 
-        # --- DIALOG editor ---
+    def _build_dialog(self) -> QtWidgets.QWidget:
+        # DIALOG editor
         self.pgDLG = QtWidgets.QWidget()
         fd = QtWidgets.QFormLayout(self.pgDLG)
         self.edSpeaker = QtWidgets.QLineEdit()
         self.edText = QtWidgets.QPlainTextEdit()
         self.spCps = _spin(1.0, 200.0, 1.0, decimals=1, start=24.0)
         self.spDurDLG = _spin(0.10, 999.0, 0.05, decimals=2, start=1.5)
-        fd.addRow("Speaker", self.edSpeaker)
-        fd.addRow("Text", self.edText)
-        fd.addRow("Chars/sec", self.spCps)
-        fd.addRow("Duration (s)", self.spDurDLG)
-        self.stack.addWidget(self.pgDLG)
-
-        # --- SFX editor ---
+        for label, field in (
+            ("Speaker", self.edSpeaker), ("Text", self.edText),
+            ("Chars/sec", self.spCps), ("Duration (s)", self.spDurDLG),
+        ):
+            fd.addRow(label, field)
+        return self.pgDLG
+
+    def _build_sfx(self) -> QtWidgets.QWidget:
+        # SFX editor
         self.pgSFX = QtWidgets.QWidget()
         ff = QtWidgets.QFormLayout(self.pgSFX)
         self.edSfxPath = QtWidgets.QLineEdit()
@@ -117,10 +317,11 @@ class KeyframeEditor(QtWidgets.QWidget):
         rowSFX = QtWidgets.QHBoxLayout(); rowSFX.addWidget(self.edSfxPath, 1); rowSFX.addWidget(btnPickSfx)
         self.spVolSfx = _spin(0.0, 1.0, 0.05, start=1.0)
         ff.addRow("File", rowSFX); ff.addRow("Volume", self.spVolSfx)
-        self.stack.addWidget(self.pgSFX)
         btnPickSfx.clicked.connect(self._pick_audio_sfx)
+        return self.pgSFX
 
-        # --- MUSIC editor ---
+    def _build_music(self) -> QtWidgets.QWidget:
+        # MUSIC editor
         self.pgMUS = QtWidgets.QWidget()
         fm = QtWidgets.QFormLayout(self.pgMUS)
         self.edMusPath = QtWidgets.QLineEdit()
@@ -128,16 +329,17 @@ class KeyframeEditor(QtWidgets.QWidget):
         rowM = QtWidgets.QHBoxLayout(); rowM.addWidget(self.edMusPath, 1); rowM.addWidget(btnPickMus)
         self.spVolMus = _spin(0.0, 1.0, 0.05, start=1.0)
         fm.addRow("File", rowM); fm.addRow("Volume", self.spVolMus)
-        self.stack.addWidget(self.pgMUS)
         btnPickMus.clicked.connect(self._pick_audio_mus)
+        return self.pgMUS
 
-        # --- FX editor (overlay/shake) ---
+    def _build_fx(self) -> QtWidgets.QWidget:
+        # FX editor (overlay/shake)
         self.pgFX = QtWidgets.QWidget()
         fx = QtWidgets.QFormLayout(self.pgFX)
-        self.cbFXMode = QtWidgets.QComboBox()
-        self.cbFXMode.addItems(["black", "white", "translucent", "shake"])
+        self.cbFXMode = _ChoiceCombo(["black", "white", "translucent", "shake"])
         self.spFXDur = _spin(0.05, 60.0, 0.05, decimals=2, start=1.0)
         self.edFXColor = QtWidgets.QLineEdit("#000000")
+        self.edFXColor.setValidator(color_validator())
         self.spFrom = _spin(0.0, 1.0, 0.05, start=0.0)
         self.spTo   = _spin(0.0, 1.0, 0.05, start=1.0)
         # shake
@@ -146,17 +348,21 @@ class KeyframeEditor(QtWidgets.QWidget):
         self.spDecay = _spin(0.0, 10.0, 0.1, start=2.5)
         self.spSeed = QtWidgets.QSpinBox(); self.spSeed.setRange(0, 1_000_000)
 
-        fx.addRow("Mode", self.cbFXMode)
-        fx.addRow("Duration (s)", self.spFXDur)
-        fx.addRow("Color (hex)", self.edFXColor)
-        fx.addRow("From α", self.spFrom); fx.addRow("To α", self.spTo)
-        fx.addRow("Amplitude (px)", self.spAmp)
-        fx.addRow("Frequency (Hz)", self.spFreq)
-        fx.addRow("Decay", self.spDecay)
-        fx.addRow("Seed", self.spSeed)
-        self.stack.addWidget(self.pgFX)
-
-        # --- MENU editor (prompt + options table) ---
+        for label, field in (
+            ("Mode", self.cbFXMode),
+            ("Duration (s)", self.spFXDur),
+            ("Color (hex)", self.edFXColor),
+            ("From α", self.spFrom), ("To α", self.spTo),
+            ("Amplitude (px)", self.spAmp),
+            ("Frequency (Hz)", self.spFreq),
+            ("Decay", self.spDecay),
+            ("Seed", self.spSeed),
+        ):
+            fx.addRow(label, field)
+        return self.pgFX
+
+    def _build_menu(self) -> QtWidgets.QWidget:
+        # MENU editor (prompt + options table)
         self.pgMENU = QtWidgets.QWidget()
         ml = QtWidgets.QVBoxLayout(self.pgMENU)
         formM = QtWidgets.QFormLayout()
@@ -168,9 +374,11 @@ class KeyframeEditor(QtWidgets.QWidget):
         paletteRow = QtWidgets.QHBoxLayout()
         paletteRow.addWidget(QtWidgets.QLabel("Palette"))
         self.cbMenuPalette = QtWidgets.QComboBox()
+        self.cbMenuPalette.blockSignals(True)
         for palette in MENU_PALETTES.values():
             self.cbMenuPalette.addItem(palette.name, palette.key)
-        self.cbMenuPalette.setCurrentText(DEFAULT_MENU_PALETTE.name)
+        self.cbMenuPalette.setCurrentIndex(max(0, self.cbMenuPalette.findData(DEFAULT_MENU_PALETTE.key)))
+        self.cbMenuPalette.blockSignals(False)
         paletteRow.addWidget(self.cbMenuPalette, 1)
 
         paletteRow.addWidget(QtWidgets.QLabel("Panel Opacity"))
@@ -192,13 +400,12 @@ class KeyframeEditor(QtWidgets.QWidget):
         bgOpacityRow.addWidget(self.spMenuBackgroundOpacity)
         ml.addLayout(bgOpacityRow)
 
-        self.tblOptions = QtWidgets.QTableWidget(0, 4)
-        self.tblOptions.setHorizontalHeaderLabels([
-            "Text",
-            "Target (label or time)",
-            "Script Asset",
-            "Inline Script"
-        ])
+        self._opts_model = MenuOptionsModel(self)
+        for sig in (self._opts_model.dataChanged, self._opts_model.rowsInserted, self._opts_model.rowsRemoved,
+                    self._opts_model.rowsMoved, self._opts_model.modelReset):
+            sig.connect(self._menu_options_changed)
+        self.tblOptions = QtWidgets.QTableView()
+        self.tblOptions.setModel(self._opts_model)
         self.tblOptions.horizontalHeader().setStretchLastSection(True)
         self.tblOptions.verticalHeader().setVisible(False)
         self.tblOptions.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
@@ -207,11 +414,9 @@ class KeyframeEditor(QtWidgets.QWidget):
         ml.addWidget(self.tblOptions, 1)
 
         # Script help (concise cheat-sheet)
-        self.lblMenuHelp = QtWidgets.QLabel(
-            "Commands: jump <label|sec>; loop <label|sec>; pause; resume"
-        )
+        self.lblMenuHelp = QtWidgets.QLabel(_MENU_HELP_TEXT)
         self.lblMenuHelp.setWordWrap(True)
-        self.lblMenuHelp.setStyleSheet("color: #9aa; font-size: 11px;")
+        self.lblMenuHelp.setStyleSheet(_HELP_CSS)
         ml.addWidget(self.lblMenuHelp)
 
         btnRow = QtWidgets.QHBoxLayout()
@@ -231,157 +436,102 @@ class KeyframeEditor(QtWidgets.QWidget):
         btnRow.addWidget(self.btnEditScript)
         ml.addLayout(btnRow)
 
-        self.stack.addWidget(self.pgMENU)
-
         self.btnAddOpt.clicked.connect(self._opt_add)
         self.btnRemOpt.clicked.connect(self._opt_remove)
-        self.btnUpOpt.clicked.connect(lambda: self._opt_move(-1))
-        self.btnDnOpt.clicked.connect(lambda: self._opt_move(1))
+        self.btnUpOpt.clicked.connect(partial(self._opt_move, -1))
+        self.btnDnOpt.clicked.connect(partial(self._opt_move, 1))
         self.btnLinkScript.clicked.connect(self._opt_link_script)
         self.btnEditScript.clicked.connect(self._opt_edit_script)
         self.btnMenuBackground.clicked.connect(self._pick_menu_background)
-        self.tblOptions.itemSelectionChanged.connect(self._update_menu_buttons)
+        # add/remove/move/load refresh the buttons themselves; this covers clicks and arrow keys
+        self.tblOptions.selectionModel().currentRowChanged.connect(self._update_menu_buttons)
         self._update_menu_buttons()
+        return self.pgMENU
 
-        # --- LOGIC editor (label / jump) ---
+    def _build_logic(self) -> QtWidgets.QWidget:
+        # LOGIC editor (label / jump)
         self.pgLOG = QtWidgets.QWidget()
         lg = QtWidgets.QFormLayout(self.pgLOG)
-        self.cbLogicType = QtWidgets.QComboBox()
-        self.cbLogicType.addItems(["label", "jump"])
+        self.cbLogicType = _ChoiceCombo(["label", "jump"])
         self.edLabelName = QtWidgets.QLineEdit()
         self.edJumpTarget = QtWidgets.QLineEdit()
-        lg.addRow("Type", self.cbLogicType)
-        lg.addRow("Label name", self.edLabelName)
-        lg.addRow("Jump target", self.edJumpTarget)
-        self.stack.addWidget(self.pgLOG)
-
-        def _logic_changed(_idx: int):
-            t = self.cbLogicType.currentText()
-            self.edLabelName.setEnabled(t == "label")
-            self.edJumpTarget.setEnabled(t == "jump")
-        self.cbLogicType.currentIndexChanged.connect(_logic_changed)
-        _logic_changed(0)
-
-        # --- common: time + save button ---
-        self.spTime = _spin(0.0, 9999.0, 0.05, decimals=3, start=0.0)
-        rowBottom = QtWidgets.QHBoxLayout()
-        rowBottom.addWidget(QtWidgets.QLabel("Start (s):"))
-        rowBottom.addWidget(self.spTime, 1)
-        self.btnApply = QtWidgets.QPushButton("Apply")
-        rowBottom.addWidget(self.btnApply)
-        self.layout().addLayout(rowBottom)
-
-        self.btnApply.clicked.connect(self._emit_update)
-
-        # default page
-        self._showPage(None)
-
-    def _update_sprite_anim_fields(self, state: bool):
-        widgets = (self.spX2, self.spY2, self.spW2, self.spH2, self.spOp2)
-        for w in widgets:
-            w.setEnabled(bool(state))
+        for label, field in (
+            ("Type", self.cbLogicType),
+            ("Label name", self.edLabelName),
+            ("Jump target", self.edJumpTarget),
+        ):
+            lg.addRow(label, field)
+        self.cbLogicType.currentIndexChanged.connect(self._logic_changed)
+        self._logic_changed(0)
+        return self.pgLOG
+
+    def _logic_changed(self, _idx: int):
+        t = self.cbLogicType.choice()
+        self.edLabelName.setEnabled(t == "label")
+        self.edJumpTarget.setEnabled(t == "jump")
 
     # ---------- public API ----------
-    def load(self, track: str, kf: Keyframe):
+    def clear(self):
+        """Forget the loaded keyframe (selection cleared, or the model was reloaded)."""
+        self._track = None
+        self._kf = None
+        self._kf_t = None
+        self._kf_data = {}
+        self.lblHeader.setText("No selection")
+        self._showPage(None)
+
+    def load(self, track: str, kf: Keyframe, force: bool = False):
+        # reselecting an unchanged keyframe keeps the page as it is
+        if (not force and track == self._track and self._kf is not None and self._kf.id == kf.id
+                and self._kf_t == kf.t and self._kf_data == kf.data):
+            return
         self._track = track
         self._kf = kf
+        # the model edits keyframes in place, so compare against copies
+        self._kf_t = kf.t
+        self._kf_data = dict(kf.data or {})
+        self._cached_asset_root = None  # project may have been saved/loaded elsewhere
         self.lblHeader.setText(f"{track}  •  id={kf.id}")
 
         d = kf.data or {}
         self.spTime.setValue(float(kf.t))
+        page = self._page(track)
 
-        if track == "BG":
-            self._showPage(self.pgBG)
-            self.edBGPath.setText(d.get("value", ""))
-            self.cbFit.setCurrentText(str(d.get("fit", "cover")).lower())
-            self.cbAlign.setCurrentText(str(d.get("align", "center")))
-            self.spZoom.setValue(float(d.get("zoom", 1.0)))
-            self.spDurBG.setValue(float(d.get("duration", d.get("xfade", 1.0))))
-        elif track == "SPRITE":
-            self._showPage(self.pgSPR)
-            self.edSprPath.setText(d.get("value", ""))
-            self.spX.setValue(float(d.get("x", 0.5)))
-            self.spY.setValue(float(d.get("y", 0.6)))
-            self.spW.setValue(float(d.get("w", 0.26)))
-            self.spH.setValue(float(d.get("h", 0.45)))
-            self.spOp.setValue(float(d.get("opacity", 1.0)))
-            self.spDurSPR.setValue(float(d.get("duration", 1.0)))
-            has_anim = any(key in d for key in ("x2", "y2", "w2", "h2", "opacity2"))
-            self.chkSprAnim.blockSignals(True)
-            self.chkSprAnim.setChecked(has_anim)
-            self._update_sprite_anim_fields(has_anim)
-            self.spX2.setValue(float(d.get("x2", self.spX.value())))
-            self.spY2.setValue(float(d.get("y2", self.spY.value())))
-            self.spW2.setValue(float(d.get("w2", self.spW.value())))
-            self.spH2.setValue(float(d.get("h2", self.spH.value())))
-            self.spOp2.setValue(float(d.get("opacity2", self.spOp.value())))
-            self.chkSprAnim.blockSignals(False)
-        elif track == "DIALOG":
-            self._showPage(self.pgDLG)
-            self.edSpeaker.setText(d.get("speaker", ""))
-            self.edText.setPlainText(d.get("text", ""))
-            self.spCps.setValue(float(d.get("cps", 24.0)))
-            self.spDurDLG.setValue(float(d.get("duration", 1.5)))
-        elif track == "SFX":
-            self._showPage(self.pgSFX)
-            self.edSfxPath.setText(d.get("value", ""))
-            self.spVolSfx.setValue(float(d.get("vol", 1.0)))
-        elif track == "MUSIC":
-            self._showPage(self.pgMUS)
-            self.edMusPath.setText(d.get("value", ""))
-            self.spVolMus.setValue(float(d.get("vol", 1.0)))
-        elif track == "FX":
-            self._showPage(self.pgFX)
-            self.cbFXMode.setCurrentText(str(d.get("mode", "black")).lower())
-            self.spFXDur.setValue(float(d.get("duration", 1.0)))
-            self.edFXColor.setText(str(d.get("color", "#000000")))
-            self.spFrom.setValue(float(d.get("from_alpha", d.get("from", 0.0))))
-            self.spTo.setValue(float(d.get("to_alpha",   d.get("to",   1.0))))
-            self.spAmp.setValue(float(d.get("amplitude", 16.0)))
-            self.spFreq.setValue(float(d.get("frequency", 12.0)))
-            self.spDecay.setValue(float(d.get("decay", 2.5)))
-            self.spSeed.setValue(int(d.get("seed", 0)))
-        elif track == "MENU":
-            self._showPage(self.pgMENU)
-            self.edMenuPrompt.setPlainText(d.get("prompt", ""))
-            palette_key = str(d.get("palette") or DEFAULT_MENU_PALETTE.key).lower()
-            idx = self.cbMenuPalette.findData(palette_key)
-            if idx < 0:
-                idx = self.cbMenuPalette.findData(DEFAULT_MENU_PALETTE.key)
-            self.cbMenuPalette.setCurrentIndex(max(0, idx))
-            self.spMenuPanelOpacity.setValue(float(d.get("panel_opacity", 0.85)))
-            self.edMenuBackground.setText(d.get("background", ""))
-            self.spMenuBackgroundOpacity.setValue(float(d.get("background_opacity", 0.3)))
-
-            # Accept both new format ([{"text","target","script"?}, ...]) and legacy ([str, ...])
-            opts = d.get("options", [])
-            self.tblOptions.setRowCount(0)
-            for opt in opts:
-                if isinstance(opt, dict):
-                    text = str(opt.get("text", "Option"))
-                    target = str(opt.get("target", ""))
-                    script_path = str(opt.get("script_path") or opt.get("script_asset") or "")
-                    inline_script = str(opt.get("script", ""))
-                else:
-                    text = str(opt)
-                    target = ""
-                    script_path = ""
-                    inline_script = ""
-                self._opt_append_row(text, target, script_path, inline_script)
-            if self.tblOptions.rowCount() > 0:
-                self.tblOptions.selectRow(0)
-            self._update_menu_buttons()
-        elif track == "LOGIC":
-            self._showPage(self.pgLOG)
-            t = str(d.get("type", "label")).lower()
-            if t not in ("label", "jump"): t = "label"
-            self.cbLogicType.setCurrentText(t)
-            self.edLabelName.setText(d.get("name", "Start"))
-            self.edJumpTarget.setText(d.get("target", "Start"))
-        else:
-            self._showPage(None)
+        loader = self._loaders.get(track)
+        if loader is None:
+            self._showPage(page)
+            return
+        # populate silently with the page's painting held, then switch to it;
+        # loaders refresh dependent state themselves
+        page.setUpdatesEnabled(False)
+        blockers = [QtCore.QSignalBlocker(w) for w in self._populated_widgets(track)]
+        try:
+            loader(d)
+        finally:
+            for b in blockers:
+                b.unblock()
+            page.setUpdatesEnabled(True)
+        self._showPage(page)
 
     # ---------- internals ----------
+    def _page(self, track: str) -> Optional[QtWidgets.QWidget]:
+        page = self._pages.get(track)
+        if page is None:
+            builder = self._builders.get(track)
+            if builder is None:
+                return None
+            page = self._pages[track] = builder()
+            self.stack.addWidget(page)
+        return page
+
+    def _populated_widgets(self, track: str) -> Tuple[QtWidgets.QWidget, ...]:
+        # input widgets the loader writes to; pages never change after they are built
+        ws = self._page_inputs.get(track)
+        if ws is None:
+            ws = self._page_inputs[track] = tuple(
+                w for w in self._pages[track].findChildren(QtWidgets.QWidget) if isinstance(w, _INPUT_TYPES))
+        return ws
+
     def _showPage(self, page: Optional[QtWidgets.QWidget]):
         if page is None:
             self.stack.setCurrentIndex(-1)
@@ -393,73 +543,23 @@ class KeyframeEditor(QtWidgets.QWidget):
     def _emit_update(self):
         if not (self._track and self._kf):
             return
-        data: Dict[str, Any] = {}
+        # spinboxes don't track keystrokes; take text still being typed (Apply may not take focus)
+        self.spTime.interpretText()
+        if self._track in self._pages:
+            for w in self._populated_widgets(self._track):
+                if isinstance(w, QtWidgets.QAbstractSpinBox):
+                    w.interpretText()
         t = float(self.spTime.value())
-
-        if self._track == "BG":
-            data = {
-                "value": self.edBGPath.text(),
-                "fit": self.cbFit.currentText(),
-                "align": self.cbAlign.currentText(),
-                "zoom": float(self.spZoom.value()),
-                "duration": float(self.spDurBG.value()),
-            }
-        elif self._track == "SPRITE":
-            data = {
-                "value": self.edSprPath.text(),
-                "x": float(self.spX.value()),
-                "y": float(self.spY.value()),
-                "w": float(self.spW.value()),
-                "h": float(self.spH.value()),
-                "opacity": float(self.spOp.value()),
-                "duration": float(self.spDurSPR.value()),
-            }
-            if self.chkSprAnim.isChecked():
-                data.update({
-                    "x2": float(self.spX2.value()),
-                    "y2": float(self.spY2.value()),
-                    "w2": float(self.spW2.value()),
-                    "h2": float(self.spH2.value()),
-                    "opacity2": float(self.spOp2.value()),
-                })
-        elif self._track == "DIALOG":
-            data = {
-                "speaker": self.edSpeaker.text(),
-                "text": self.edText.toPlainText(),
-                "cps": float(self.spCps.value()),
-                "duration": float(self.spDurDLG.value()),
-            }
-        elif self._track == "SFX":
-            data = {"value": self.edSfxPath.text(), "vol": float(self.spVolSfx.value())}
-        elif self._track == "MUSIC":
-            data = {"value": self.edMusPath.text(), "vol": float(self.spVolMus.value())}
-        elif self._track == "FX":
-            data = {
-                "mode": self.cbFXMode.currentText(),
-                "duration": float(self.spFXDur.value()),
-                "color": self.edFXColor.text(),
-                "from_alpha": float(self.spFrom.value()),
-                "to_alpha": float(self.spTo.value()),
-                "amplitude": float(self.spAmp.value()),
-                "frequency": float(self.spFreq.value()),
-                "decay": float(self.spDecay.value()),
-                "seed": int(self.spSeed.value()),
-            }
-        elif self._track == "MENU":
-            data = {
-                "prompt": self.edMenuPrompt.toPlainText(),
-                "options": self._collect_menu_options(),
-                "palette": self.cbMenuPalette.currentData(),
-                "panel_opacity": float(self.spMenuPanelOpacity.value()),
-                "background": self.edMenuBackground.text(),
-                "background_opacity": float(self.spMenuBackgroundOpacity.value()),
-            }
-        elif self._track == "LOGIC":
-            tname = self.cbLogicType.currentText()
-            if tname == "label":
-                data = {"type": "label", "name": self.edLabelName.text().strip() or "Start"}
-            else:
-                data = {"type": "jump", "target": self.edJumpTarget.text().strip() or "Start"}
+        saver = self._savers.get(self._track)
+        data: Dict[str, Any] = saver() if saver is not None else {}
+        # nothing to apply if the block already holds it; compare with the keyframe itself,
+        # since timeline drags and resizes change it without reloading the editor
+        kf = self._kf
+        if t == kf.t and all(kf.data.get(k) == v for k, v in data.items()):
+            return
+        # the receiver merges data into the keyframe; keep load()'s unchanged-check in step
+        self._kf_t = t
+        self._kf_data = {**self._kf_data, **data}
 
         self.edited.emit({
             "track": self._track,
@@ -468,15 +568,110 @@ class KeyframeEditor(QtWidgets.QWidget):
             "data": data,
         })
 
+    # --- per-track load/save ---
+    def _bound_fields(self, track: str) -> tuple:
+        # _TRACK_SCHEMA resolved against this page's widgets:
+        # (saved key, legacy aliases or None, widget, setter, getter, default)
+        fields = self._page_fields.get(track)
+        if fields is None:
+            rows = []
+            for key, attr, default in _TRACK_SCHEMA[track]:
+                w = getattr(self, attr)
+                setter, getter = _FIELD_IO[type(w)]
+                if isinstance(key, tuple):
+                    rows.append((key[0], key, w, setter, getter, default))
+                else:
+                    rows.append((key, None, w, setter, getter, default))
+            fields = self._page_fields[track] = tuple(rows)
+        return fields
+
+    def _load_fields(self, track: str, d: Dict[str, Any]):
+        for key, aliases, w, setter, _getter, default in self._bound_fields(track):
+            setter(w, _first(d, aliases, default) if aliases else d.get(key, default))
+
+    def _save_fields(self, track: str) -> Dict[str, Any]:
+        return {key: getter(w) for key, _aliases, w, _setter, getter, _default in self._bound_fields(track)}
+
+    def _load_sprite(self, d: Dict[str, Any]):
+        self._load_fields("SPRITE", d)
+        has_anim = any(key in d for key, _src, _dst in _SPRITE_TARGETS)
+        self.chkSprAnim.setChecked(has_anim)
+        self._update_sprite_anim_fields(has_anim)
+        for key, src, dst in _SPRITE_TARGETS:
+            _set_value(getattr(self, dst), float(d.get(key, getattr(self, src).value())))
+
+    def _save_sprite(self) -> Dict[str, Any]:
+        data = self._save_fields("SPRITE")
+        if self.chkSprAnim.isChecked():
+            for key, _src, dst in _SPRITE_TARGETS:
+                data[key] = getattr(self, dst).value()
+        return data
+
+    def _load_menu(self, d: Dict[str, Any]):
+        _set_plain_text(self.edMenuPrompt, str(d.get("prompt", "")))
+        palette_key = str(d.get("palette") or DEFAULT_MENU_PALETTE.key).lower()
+        idx = self.cbMenuPalette.findData(palette_key)
+        if idx < 0:
+            idx = self.cbMenuPalette.findData(DEFAULT_MENU_PALETTE.key)
+        self.cbMenuPalette.setCurrentIndex(max(0, idx))
+        self._load_fields("MENU", d)
+
+        # Accept both new format ([{"text","target","script"?}, ...]) and legacy ([str, ...])
+        opts = d.get("options", [])
+        rows = []
+        for opt in opts:
+            if isinstance(opt, dict):
+                text = str(opt.get("text", "Option"))
+                target = str(opt.get("target", ""))
+                script_path = str(opt.get("script_path") or opt.get("script_asset") or "")
+                inline_script = str(opt.get("script", ""))
+            else:
+                text = str(opt)
+                target = ""
+                script_path = ""
+                inline_script = ""
+            rows.append((text, target, script_path, inline_script))
+
+        self._opts_model.set_rows(rows)
+        if rows:
+            self.tblOptions.selectRow(0)
+        self._update_menu_buttons()
+
+    def _save_menu(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            "prompt": self.edMenuPrompt.toPlainText(),
+            "options": self._collect_menu_options(),
+            "palette": self.cbMenuPalette.currentData(),
+        }
+        data.update(self._save_fields("MENU"))
+        return data
+
+    def _load_logic(self, d: Dict[str, Any]):
+        self.cbLogicType.setCurrentIndex(self.cbLogicType.index_of.get(str(d.get("type", "label")).lower(), 0))
+        _set_text(self.edLabelName, str(d.get("name", "Start")))
+        _set_text(self.edJumpTarget, str(d.get("target", "Start")))
+        self._logic_changed(self.cbLogicType.currentIndex())
+
+    def _save_logic(self) -> Dict[str, Any]:
+        tname = self.cbLogicType.choice()
+        if tname == "label":
+            return {"type": "label", "name": self.edLabelName.text().strip() or "Start"}
+        return {"type": "jump", "target": self.edJumpTarget.text().strip() or "Start"}
+
     # --- menu options helpers ---
+    def _menu_options_changed(self, *_args):
+        self._menu_opts = None
+
     def _collect_menu_options(self) -> List[dict]:
+        if self._menu_opts is not None:
+            # fresh dicts: Apply stores the result in the keyframe, which is edited in place
+            return [dict(o) for o in self._menu_opts]
         opts: List[dict] = []
-        for r in range(self.tblOptions.rowCount()):
-            text = self._table_text(r, 0) or "Option"
-            target = self._table_text(r, 1)
-            script_path = self._table_text(r, 2)
-            inline_script = self._table_text(r, 3)
-            row: dict = {"text": text}
+        for text, target, script_path, inline_script in self._opts_model.rows():
+            target = target.strip()
+            script_path = script_path.strip()
+            inline_script = inline_script.strip()
+            row: dict = {"text": text.strip() or "Option"}
             if target:
                 row["target"] = target
             if script_path:
@@ -484,161 +679,167 @@ class KeyframeEditor(QtWidgets.QWidget):
             if inline_script:
                 row["script"] = inline_script
             opts.append(row)
-        return opts
+        self._menu_opts = opts
+        return [dict(o) for o in opts]
 
-    def _table_text(self, row: int, col: int) -> str:
-        item = self.tblOptions.item(row, col)
-        return item.text().strip() if item else ""
+    def _opt_row(self) -> int:
+        return self.tblOptions.currentIndex().row()
 
     def _opt_append_row(self, text: str, target: str, script_path: str = "", inline_script: str = ""):
-        r = self.tblOptions.rowCount()
-        self.tblOptions.insertRow(r)
-        self.tblOptions.setItem(r, 0, QtWidgets.QTableWidgetItem(text))
-        self.tblOptions.setItem(r, 1, QtWidgets.QTableWidgetItem(target))
-        self.tblOptions.setItem(r, 2, QtWidgets.QTableWidgetItem(script_path))
-        self.tblOptions.setItem(r, 3, QtWidgets.QTableWidgetItem(inline_script))
+        self._opts_model.append_row((text, target, script_path, inline_script))
 
     def _opt_add(self):
         self._opt_append_row("Option", "", "", "")
-        self.tblOptions.selectRow(self.tblOptions.rowCount() - 1)
-        self.tblOptions.editItem(self.tblOptions.item(self.tblOptions.rowCount() - 1, 0))
+        r = self._opts_model.rowCount() - 1
+        self.tblOptions.selectRow(r)
+        self.tblOptions.edit(self._opts_model.index(r, 0))
         self._update_menu_buttons()
 
     def _opt_remove(self):
-        r = self.tblOptions.currentRow()
+        r = self._opt_row()
         if r >= 0:
-            self.tblOptions.removeRow(r)
-            self.tblOptions.selectRow(max(0, min(r, self.tblOptions.rowCount()-1)))
+            self._opts_model.removeRow(r)
+            self.tblOptions.selectRow(max(0, min(r, self._opts_model.rowCount()-1)))
         self._update_menu_buttons()
 
     def _opt_move(self, delta: int):
-        r = self.tblOptions.currentRow()
+        r = self._opt_row()
         if r < 0: return
         new_r = r + delta
-        if 0 <= new_r < self.tblOptions.rowCount():
-            for c in range(self.tblOptions.columnCount()):
-                a = self.tblOptions.takeItem(r, c)
-                b = self.tblOptions.takeItem(new_r, c)
-                self.tblOptions.setItem(r, c, b)
-                self.tblOptions.setItem(new_r, c, a)
+        if 0 <= new_r < self._opts_model.rowCount():
+            self._opts_model.swap_rows(r, new_r)
             self.tblOptions.selectRow(new_r)
         self._update_menu_buttons()
 
+    def _opt_set_script_path(self, row: int, rel: str):
+        self._opts_model.setData(self._opts_model.index(row, 2), rel)
+
     def _opt_link_script(self):
-        row = self.tblOptions.currentRow()
+        row = self._opt_row()
         if row < 0:
             return
-        base = str((self._asset_root() / "scripts").resolve())
+        base = str(self._asset_root() / "scripts")
         path, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Select Script", base, "Python Files (*.py)")
         if not path:
             return
         rel = self._normalize_script_path(path)
-        if not self.tblOptions.item(row, 2):
-            self.tblOptions.setItem(row, 2, QtWidgets.QTableWidgetItem(rel))
-        else:
-            self.tblOptions.item(row, 2).setText(rel)
+        self._opt_set_script_path(row, rel)
         self._update_menu_buttons()
 
     def _opt_edit_script(self):
-        row = self.tblOptions.currentRow()
+        row = self._opt_row()
         if row < 0:
             return
-        current = self._table_text(row, 2)
+        current = self._opts_model.rows()[row][2].strip()
         create = False
         if not current:
-            base = str((self._asset_root() / "scripts").resolve())
+            base = str(self._asset_root() / "scripts")
             path, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Create Script", base, "Python Files (*.py)")
             if not path:
                 return
             rel = self._normalize_script_path(path)
             current = rel
-            if not self.tblOptions.item(row, 2):
-                self.tblOptions.setItem(row, 2, QtWidgets.QTableWidgetItem(rel))
-            else:
-                self.tblOptions.item(row, 2).setText(rel)
+            self._opt_set_script_path(row, rel)
             create = True
         if current:
             self.scriptRequested.emit(current, create)
         self._update_menu_buttons()
 
-    def _pick_menu_background(self):
-        base = str((self._asset_root() / "menus").resolve())
-        Path(base).mkdir(parents=True, exist_ok=True)
-        path, _ = QtWidgets.QFileDialog.getOpenFileName(
-            self, "Select Menu Background", base, "Images (*.png *.jpg *.jpeg *.bmp *.gif)"
-        )
-        if not path:
-            return
-        rel = self._normalize_script_path(path)
-        self.edMenuBackground.setText(rel)
-
     def _normalize_script_path(self, path: str) -> str:
+        root = self._asset_root()
         w = self.window()
         if w and hasattr(w, "model"):
             try:
                 return w.model.normalize_asset_value(path)  # type: ignore[attr-defined]
             except Exception:
                 pass
+        # pure string math first; only touch the filesystem for paths outside the root
+        try:
+            rel = os.path.relpath(os.path.abspath(path), str(root))
+        except ValueError:  # different drive on Windows
+            rel = os.pardir
+        if rel != os.pardir and not rel.startswith(os.pardir + os.sep):
+            return rel.replace(os.sep, "/")
         p = Path(path)
-        root = self._asset_root()
         try:
             return p.resolve().relative_to(root).as_posix()
         except Exception:
             return str(p)
 
     def _asset_root(self) -> Path:
-        w = self.window()
-        if w and hasattr(w, "model"):
-            return Path(w.model.asset_root)
-        return Path.cwd()
+        root = self._cached_asset_root
+        if root is None:
+            w = self.window()
+            if w and hasattr(w, "model"):
+                root = Path(w.model.asset_root).resolve()
+            else:
+                root = Path.cwd()
+            self._cached_asset_root = root
+        return root
 
     def _update_menu_buttons(self):
-        row = self.tblOptions.currentRow()
+        row = self._opt_row()
         has_row = row >= 0
-        count = self.tblOptions.rowCount()
+        count = self._opts_model.rowCount()
         self.btnRemOpt.setEnabled(has_row)
         self.btnUpOpt.setEnabled(has_row and row > 0)
         self.btnDnOpt.setEnabled(has_row and row < count - 1)
         self.btnLinkScript.setEnabled(has_row)
         self.btnEditScript.setEnabled(has_row)
 
-    # pickers
+    # pickers (one reusable dialog per file kind; the image pickers share theirs)
+    def _pick_file(self, kind: str, title: str, directory: str = "") -> str:
+        dlg = self._file_dialogs.get(kind)
+        if dlg is None:
+            dlg = self._file_dialogs[kind] = QtWidgets.QFileDialog(self)
+            dlg.setFileMode(QtWidgets.QFileDialog.ExistingFile)
+            dlg.setNameFilter(_FILE_FILTERS[kind])
+        dlg.setWindowTitle(title)
+        if directory:
+            dlg.setDirectory(directory)
+        if not dlg.exec():
+            return ""
+        files = dlg.selectedFiles()
+        return files[0] if files else ""
+
     def _pick_bg(self):
-        fn, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Pick Background", "", "Images (*.png *.jpg *.jpeg *.bmp *.gif)")
+        fn = self._pick_file("image", "Pick Background")
         if fn:
             self.edBGPath.setText(fn)
 
     def _pick_sprite(self):
-        fn, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Pick Sprite", "", "Images (*.png *.jpg *.jpeg *.bmp *.gif)")
+        fn = self._pick_file("image", "Pick Sprite")
         if fn:
             self.edSprPath.setText(fn)
 
     def _pick_audio_sfx(self):
-        fn, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Pick SFX", "", "Audio (*.wav *.mp3 *.ogg)")
+        fn = self._pick_file("audio", "Pick SFX")
         if fn:
             self.edSfxPath.setText(fn)
 
     def _pick_audio_mus(self):
-        fn, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Pick Music", "", "Audio (*.wav *.mp3 *.ogg)")
+        fn = self._pick_file("audio", "Pick Music")
         if fn:
             self.edMusPath.setText(fn)
 
     def _pick_menu_background(self):
-        base = str((self._asset_root() / "menus").resolve())
-        fn, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Pick Menu Background", base, "Images (*.png *.jpg *.jpeg *.bmp *.gif)")
+        base = self._asset_root() / "menus"
+        if base != self._menus_dir_made:  # once per asset root
+            base.mkdir(parents=True, exist_ok=True)
+            self._menus_dir_made = base
+        fn = self._pick_file("menu_image", "Pick Menu Background", str(base))
         if fn:
-            try:
-                norm = self.window().model.normalize_asset_value(fn)  # type: ignore[attr-defined]
-            except Exception:
-                norm = fn
-            self.edMenuBackground.setText(norm)
-
+            self.edMenuBackground.setText(self._normalize_script_path(fn))
 
 def _spin(lo: float, hi: float, step: float, *, decimals: int = 3, start: float = 0.0):
     s = QtWidgets.QDoubleSpinBox()
+    s.blockSignals(True)
+    # decimals first: setRange/setValue round to the current precision
     s.setDecimals(decimals)
     s.setRange(lo, hi)
     s.setSingleStep(step)
     s.setValue(start)
+    s.setKeyboardTracking(False)  # values are only read on Apply
+    s.blockSignals(False)
     return s
 
@@ -1,5 +1,8 @@
 # mainwindow.py — timeline at bottom (with TimelinePanel wrapper)
 from __future__ import annotations
+import bisect
+from functools import partial
+from operator import attrgetter
 from typing import Optional
 from pathlib import Path
 from PySide6 import QtCore, QtGui, QtWidgets
@@ -9,11 +12,23 @@ from editor import KeyframeEditor
 from assets import AssetsDock
 from script_editor import ScriptEditorDock
 from tutorial import TutorialDialog
-from project_manager import ensure_project_structure
+from project_manager import ensure_project_structure, open_project_file
 from compiler import build_project
 from vngen.widget import GameWidget
 from vngen.config import SPRITE_DEFAULTS
 
+_kf_time = attrgetter("t")
+
+# starting data for keyframes dropped from the assets dock; adders copy and fill in "value"
+_BG_TEMPLATE = {"value": "", "fit": "cover", "align": "center", "zoom": 1.0}
+_SPRITE_TEMPLATE = {"value": "", "x": 0.5, "y": 0.5, "w": SPRITE_DEFAULTS.size[0], "h": SPRITE_DEFAULTS.size[1],
+                    "opacity": SPRITE_DEFAULTS.opacity}
+_AUDIO_TEMPLATE = {"value": "", "vol": 1.0}
+
+# the extension picks the format: .json plain, .vngenz gzip-compressed
+_SAVE_FILTER = "VN Project (*.json);;Compressed VN Project (*.vngenz)"
+_LOAD_FILTER = "VN Project (*.json *.vngenz)"
+
 
 class MainWindow(QtWidgets.QMainWindow):
     def __init__(self):
@@ -55,9 +70,9 @@ class MainWindow(QtWidgets.QMainWindow):
         vsplit.addWidget(bottom)
 
         # preview drives timeline playhead (paint-only; no recentering by default)
-        self.gameWidget.playheadChanged.connect(
-            lambda t: (setattr(self.timeline, "playhead", float(t)), self.timeline.update())
-        )
+        self._scrub_guard = False
+        self._last_scrub_t = -1.0
+        self.gameWidget.playheadChanged.connect(self._on_preview_playhead)
 
         # timeline scrubbing drives preview playhead
         self.timelinePanel.playheadChanged.connect(self._on_timeline_scrub)
@@ -125,9 +140,9 @@ class MainWindow(QtWidgets.QMainWindow):
         tb.addAction(self.actSetA)
         tb.addAction(self.actSetB)
 
-        self.actLoop.toggled.connect(lambda on: setattr(self, "loop_enabled", on))
-        self.actSetA.triggered.connect(lambda: setattr(self, "loop_a", float(self.timeline.playhead)))
-        self.actSetB.triggered.connect(lambda: setattr(self, "loop_b", float(self.timeline.playhead)))
+        self.actLoop.toggled.connect(self._set_loop_enabled)
+        self.actSetA.triggered.connect(self._set_loop_a)
+        self.actSetB.triggered.connect(self._set_loop_b)
 
         # View menu: mutes + zoom helpers
         mView = self.menuBar().addMenu("&View")
@@ -152,9 +167,9 @@ class MainWindow(QtWidgets.QMainWindow):
         mView.addAction(actZoomReset)
         mView.addAction(actZoomFitPlayhead)
 
-        actZoomIn.triggered.connect(lambda: self.timelinePanel.set_zoom_px_per_sec(self.timeline.sec_to_px() + 20))
-        actZoomOut.triggered.connect(lambda: self.timelinePanel.set_zoom_px_per_sec(self.timeline.sec_to_px() - 20))
-        actZoomReset.triggered.connect(lambda: self.timelinePanel.set_zoom_px_per_sec(120.0))
+        actZoomIn.triggered.connect(partial(self.timelinePanel.adjust_zoom, 20))
+        actZoomOut.triggered.connect(partial(self.timelinePanel.adjust_zoom, -20))
+        actZoomReset.triggered.connect(partial(self.timelinePanel.set_zoom_px_per_sec, 120.0))
         actZoomFitPlayhead.triggered.connect(self.timelinePanel.center_on_playhead)
 
         # File menu
@@ -182,8 +197,24 @@ class MainWindow(QtWidgets.QMainWindow):
         self._update_mutes()
         self._on_dirty_changed(self.model.dirty)
 
-        # show tutorial on first launch
-        QtCore.QTimer.singleShot(400, self._maybe_show_tutorial)
+        # show tutorial on first launch, once the window is actually up (see showEvent)
+        self._settings: Optional[QtCore.QSettings] = None
+        self._shown_once = False
+
+    def showEvent(self, e: QtGui.QShowEvent):
+        super().showEvent(e)
+        if not self._shown_once:
+            self._shown_once = True
+            QtCore.QTimer.singleShot(0, self._maybe_show_tutorial)
+
+    def _set_loop_enabled(self, on: bool):
+        self.loop_enabled = on
+
+    def _set_loop_a(self):
+        self.loop_a = float(self.timeline.playhead)
+
+    def _set_loop_b(self):
+        self.loop_b = float(self.timeline.playhead)
 
     def _update_mutes(self):
         self.gameWidget.set_mutes(self.actMuteSFX.isChecked(), self.actMuteMusic.isChecked())
@@ -223,8 +254,33 @@ class MainWindow(QtWidgets.QMainWindow):
             QtWidgets.QMessageBox.warning(self, "Script Editor", f"Unable to open script:\n{path}")
         return success
 
+    def _on_preview_playhead(self, t: float):
+        # fires every frame during playback; repaint only the old and new playhead columns,
+        # and nothing at all while the line stays on the same pixel
+        if self._scrub_guard:
+            return  # echo of our own scrub; the timeline already shows t
+        self._last_scrub_t = -1.0  # playback moved on, so the next scrub must go through
+        view = self.timeline
+        old_x = view.time_to_x(view.playhead)
+        view.playhead = float(t)
+        x = view.time_to_x(view.playhead)
+        if x == old_x:
+            return
+        h = view.height()
+        view.update(old_x - 3, 0, 6, h)
+        view.update(x - 3, 0, 6, h)
+
     def _on_timeline_scrub(self, t: float):
-        self.gameWidget.scrub_to(float(t))
+        t = float(t)
+        if self._scrub_guard or abs(t - self._last_scrub_t) < 1e-4:
+            return
+        self._scrub_guard = True
+        try:
+            # the timeline already shows t; don't have the preview echo it back
+            self.gameWidget.scrub_to(t, emit_signal=False)
+        finally:
+            self._scrub_guard = False
+        self._last_scrub_t = t
 
     def _play_preview(self):
         self.gameWidget.play()
@@ -238,11 +294,11 @@ class MainWindow(QtWidgets.QMainWindow):
     def _jump_next_keyframe(self):
         current = float(self.timeline.playhead)
         next_times = []
-        for arr in self.model.tracks.values():
-            for k in arr:
-                if k.t > current + 1e-6:
-                    next_times.append(k.t)
-                    break
+        for tr in self.model.tracks:
+            times = self.model.track_times(tr)
+            i = bisect.bisect_right(times, current + 1e-6)
+            if i < len(times):
+                next_times.append(times[i])
         if not next_times:
             return
         t = min(next_times)
@@ -278,8 +334,13 @@ class MainWindow(QtWidgets.QMainWindow):
         dlg = TutorialDialog(steps, self)
         dlg.exec()
 
+    def _app_settings(self) -> QtCore.QSettings:
+        if self._settings is None:
+            self._settings = QtCore.QSettings("VNGEN", "Studio")
+        return self._settings
+
     def _maybe_show_tutorial(self):
-        settings = QtCore.QSettings("VNGEN", "Studio")
+        settings = self._app_settings()
         if not settings.value("tutorialShown", False, type=bool):
             self._show_tutorial()
             settings.setValue("tutorialShown", True)
@@ -296,6 +357,7 @@ class MainWindow(QtWidgets.QMainWindow):
             self._selection = (track, kf_id)
         else:
             self._selection = None
+            self.editor.clear()
         self.scriptDock.set_assign_enabled(self._selection is not None)
         # let the preview know which sprite we’re editing
         if track == "SPRITE":
@@ -308,48 +370,50 @@ class MainWindow(QtWidgets.QMainWindow):
         kf = self.model.find_kf(tr, payload["kf_id"])
         if not kf:
             return
-        kf.t = float(payload["t"])
+        old_t, new_t = kf.t, float(payload["t"])
+        kf.t = new_t
         for k, v in payload["data"].items():
             if k == "value" and isinstance(v, str):
                 v = self.model.normalize_asset_value(v)
             kf.data[k] = v
-        self.model.tracks[tr].sort(key=lambda x: x.t)
+        if "duration" in payload["data"]:
+            self.model.pin_duration(tr, kf.id)
+        if new_t != old_t:
+            # the rest of the track is still sorted; re-insert just this one. Ties land where
+            # a stable sort would leave them: before equal times when moving later, after when earlier.
+            arr = self.model.tracks[tr]
+            del arr[next(i for i, k in enumerate(arr) if k is kf)]
+            insort = bisect.insort_left if new_t > old_t else bisect.insort_right
+            insort(arr, kf, key=_kf_time)
         self.model.touch(tr, recompute_duration=True)
         self.timeline.update()
 
-    # assets adders
+    # assets adders (add_kf -> modelChanged already schedules the timeline repaint)
     def _add_bg(self, path: str):
-        data = {"value": path, "fit": "cover", "align": "center", "zoom": 1.0}
+        data = _BG_TEMPLATE.copy()
+        data["value"] = path
         self.model.add_kf("BG", Keyframe(self.timeline.playhead, "BG", data), snap=True)
-        self.timeline.update()
 
     def _add_spr(self, path: str):
-        w_def, h_def = SPRITE_DEFAULTS.size
-        self.model.add_kf(
-            "SPRITE",
-            Keyframe(
-                self.timeline.playhead,
-                "SPRITE",
-                {"value": path, "x": 0.5, "y": 0.5, "w": w_def, "h": h_def, "opacity": SPRITE_DEFAULTS.opacity},
-            ),
-            snap=True,
-        )
-        self.timeline.update()
+        data = _SPRITE_TEMPLATE.copy()
+        data["value"] = path
+        self.model.add_kf("SPRITE", Keyframe(self.timeline.playhead, "SPRITE", data), snap=True)
 
     def _add_sfx(self, path: str):
-        self.model.add_kf("SFX", Keyframe(self.timeline.playhead, "SFX", {"value": path, "vol": 1.0}), snap=True)
-        self.timeline.update()
+        data = _AUDIO_TEMPLATE.copy()
+        data["value"] = path
+        self.model.add_kf("SFX", Keyframe(self.timeline.playhead, "SFX", data), snap=True)
 
     def _add_mus(self, path: str):
-        self.model.add_kf("MUSIC", Keyframe(self.timeline.playhead, "MUSIC", {"value": path, "vol": 1.0}), snap=True)
-        self.timeline.update()
+        data = _AUDIO_TEMPLATE.copy()
+        data["value"] = path
+        self.model.add_kf("MUSIC", Keyframe(self.timeline.playhead, "MUSIC", data), snap=True)
 
     def _add_script_logic(self, path: str):
         rel = self.model.normalize_asset_value(path)
         data = {"type": "script", "script_path": rel}
         kf = Keyframe(self.timeline.playhead, "LOGIC", data)
         self.model.add_kf("LOGIC", kf, snap=True)
-        self.timeline.update()
 
     def _assign_script_to_selection(self, path: str):
         if not path or not self._selection:
@@ -359,7 +423,8 @@ class MainWindow(QtWidgets.QMainWindow):
         if not kf:
             return
         rel = self.model.normalize_asset_value(path)
-        kf.data = dict(kf.data or {})
+        if not kf.data:
+            kf.data = {}
         kf.data["script_path"] = rel
         if track == "LOGIC":
             kf.data.setdefault("type", "script")
@@ -368,25 +433,26 @@ class MainWindow(QtWidgets.QMainWindow):
 
     # save/load
     def _save(self):
-        fn, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Save Project", "", "VN Project (*.json)")
+        fn, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Save Project", "", _SAVE_FILTER)
         if not fn:
             return
         try:
             project_path = ensure_project_structure(fn)
             self.model.set_project_file(str(project_path))
-            with open(project_path, "w", encoding="utf-8") as f:
-                f.write(self.model.to_json())
+            with open_project_file(project_path, "w") as f:
+                self.model.to_json_stream(f)
         except OSError as exc:
             QtWidgets.QMessageBox.critical(self, "Save Failed", str(exc))
             return
         self.model.mark_clean()
 
     def _load(self):
-        fn, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Load Project", "", "VN Project (*.json)")
+        fn, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Load Project", "", _LOAD_FILTER)
         if not fn:
             return
-        with open(fn, "r", encoding="utf-8") as f:
-            self.model.load_json(f.read(), project_file=fn)
+        with open_project_file(fn) as f:
+            self.model.load_json_stream(f, project_file=fn)
+        self._on_sel("", -1)  # keyframes were replaced; drop the stale selection
         # Refresh timeline canvas + geometry after load
         self.timelinePanel.set_zoom_px_per_sec(self.timeline.sec_to_px())
         self.timeline.update()
@@ -1,13 +1,23 @@
 # model.py
 from __future__ import annotations
+from contextlib import contextmanager
 from dataclasses import dataclass, field
+from functools import partial
 from typing import Dict, List, Tuple, Iterable, Optional
 from pathlib import Path
-import os, json
+from bisect import bisect_left, bisect_right, insort_right
+from operator import attrgetter
+import os, sys, wave
 import pygame
 from PySide6 import QtCore
 from vngen.config import TRACK_ORDER, DEFAULT_TRACK_DURATIONS, MIN_TRACK_DURATIONS
 from vngen.paths import normalize_asset_path, resolve_asset_path
+from project_manager import load_project_json, dump_project_json, write_project_json
+
+try:
+    from mutagen import File as MutagenFile  # optional: header-only audio lengths
+except ImportError:
+    MutagenFile = None
 
 TICK_SEC = 0.0333333  # visual minimum footprint in seconds
 
@@ -28,8 +38,41 @@ LOGIC = "LOGIC"
 VALUE_KEY = "value"
 DURATION_KEY = "duration"
 
+_kf_time = attrgetter("t")
+# tracks whose blocks fall back to the default length when given a non-positive duration
+_MODAL_TRACKS = frozenset((MENU, LOGIC))
+
+
+def _probe_audio_len(path: str) -> float:
+    """Length of an audio file in seconds read from its header, or 0.0 when the
+    header can't be read (see _decode_audio_len). Safe to call off the GUI thread."""
+    if MutagenFile is not None:
+        try:
+            f = MutagenFile(path)
+            if f is not None and f.info is not None and f.info.length > 0:
+                return float(f.info.length)
+        except Exception:
+            pass
+    if path.lower().endswith(".wav"):
+        try:
+            with wave.open(path, "rb") as w:
+                if w.getframerate() > 0:
+                    return w.getnframes() / float(w.getframerate())
+        except (wave.Error, EOFError, OSError):
+            pass  # e.g. float PCM, which older wave modules reject
+    return 0.0
+
+
+def _decode_audio_len(path: str) -> float:
+    """Length from decoding the whole clip with pygame. SDL_mixer loads aren't safe
+    next to playback on another thread, so only call this on the model's thread."""
+    try:
+        return float(pygame.mixer.Sound(path).get_length())
+    except Exception:
+        return 0.0
+
 
-@dataclass
+@dataclass(slots=True)
 class Keyframe:
     t: float
     track: str
@@ -44,18 +87,30 @@ class TimelineModel(QtCore.QObject):
     tracksChanged = QtCore.Signal(str)
     modelChanged = QtCore.Signal()
     dirtyChanged = QtCore.Signal(bool)
+    _audioLenReady = QtCore.Signal(str, float, float)  # resolved path, mtime, seconds (from a worker)
 
     def __init__(self, parent: Optional[QtCore.QObject] = None):
         super().__init__(parent)
         self._duration: float = 60.0
         self.tracks: Dict[str, List[Keyframe]] = {name: [] for name in TRACKS}
+        self._by_id: Dict[Tuple[str, int], Keyframe] = {}  # (track, id) -> keyframe
         self._next_id = 1
         self._listeners: List = []
         self._dirty = False
+        self._batch_depth = 0
+        self._batch_tracks: set[str] = set()  # tracks touched inside batch()
         self._project_file: Optional[Path] = None
         self._asset_root: Path = Path.cwd()
-
-        # ensure pygame mixer can be used for length guessing
+        self._normalized: Dict[str, str] = {}  # asset value -> normalized form under _asset_root
+        self._track_times: Dict[str, List[float]] = {}  # track -> sorted start times
+        self._track_ends: Dict[str, float] = {}  # track -> latest block end, for _recompute_duration
+        self._audio_len_cache: Dict[str, Tuple[float, float]] = {}  # resolved path -> (mtime, seconds)
+        self._audio_waiting: Dict[str, List[int]] = {}  # resolved path -> ids of MUSIC blocks awaiting a probe
+        self._audioLenReady.connect(self._apply_audio_len, QtCore.Qt.QueuedConnection)
+        self.tracksChanged.connect(self._drop_track_times)
+
+        # ensure pygame mixer can be used for length guessing (_decode_audio_len, for
+        # formats _probe_audio_len can't read from the header)
         if not pygame.get_init():
             pygame.init()
         if not pygame.mixer.get_init():
@@ -93,11 +148,17 @@ class TimelineModel(QtCore.QObject):
         else:
             self._project_file = None
             self._asset_root = Path.cwd()
+        self._normalized.clear()
 
     def normalize_asset_value(self, value: str) -> str:
         if not value:
             return ""
-        return normalize_asset_path(value, self._asset_root)
+        # memoized per asset root, so saves don't re-resolve every keyframe's path;
+        # interned: the same asset is usually referenced by many keyframes
+        norm = self._normalized.get(value)
+        if norm is None:
+            norm = self._normalized[value] = sys.intern(normalize_asset_path(value, self._asset_root))
+        return norm
 
     def resolve_asset_value(self, value: str) -> str:
         if not value:
@@ -122,8 +183,17 @@ class TimelineModel(QtCore.QObject):
 
     def touch(self, track: Optional[str] = None, *, recompute_duration: bool = False):
         """Notify listeners that track data changed and mark the project dirty."""
+        if track is None:
+            self._track_ends.clear()
+        else:
+            self._track_ends.pop(track, None)
         if recompute_duration:
             self._recompute_duration()
+        if self._batch_depth:
+            track = "__all__" if track is None else track
+            self._batch_tracks.add(track)
+            self._drop_track_times(track)
+            return
         self._emit()
         if track is None:
             self.tracksChanged.emit("__all__")
@@ -131,6 +201,22 @@ class TimelineModel(QtCore.QObject):
             self.tracksChanged.emit(track)
         self._set_dirty(True)
 
+    @contextmanager
+    def batch(self):
+        """Group many edits: touch() inside only records the track, and listeners
+        hear about everything once when the outermost batch exits."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._batch_tracks:
+                tracks, self._batch_tracks = self._batch_tracks, set()
+                self._emit()
+                for tr in (["__all__"] if "__all__" in tracks else sorted(tracks)):
+                    self.tracksChanged.emit(tr)
+                self._set_dirty(True)
+
     def _set_dirty(self, value: bool):
         value = bool(value)
         if self._dirty != value:
@@ -144,26 +230,89 @@ class TimelineModel(QtCore.QObject):
             self.durationChanged.emit(self._duration)
 
     def _recompute_duration(self):
+        # only tracks touched since the last call are rescanned; a drag on one
+        # track no longer walks every keyframe in the project
+        ends = self._track_ends
         longest = 0.0
         for track, arr in self.tracks.items():
-            for k in arr:
-                longest = max(longest, k.t + self._eff_duration(track, k))
+            end = ends.get(track)
+            if end is None:
+                eff = self._eff_duration
+                end = ends[track] = max((k.t + eff(track, k) for k in arr), default=0.0)
+            longest = max(longest, end)
         self._set_duration(max(longest, 60.0))
 
     # ---- audio helpers ----
-    def _guess_audio_len(self, path: str) -> float:
+    def _guess_audio_len(self, kf: Keyframe) -> float:
+        """Cached length of kf's audio, or 0.0 after queueing a background probe
+        whose result patches kf's duration (see _apply_audio_len).
+
+        Waiting blocks are remembered by MUSIC id rather than by object, so the
+        result still lands after undo/redo or a reload rebuilt the keyframes."""
+        path = str(kf.data.get(VALUE_KEY, ""))
         if not path:
             return 0.0
         resolved = self.resolve_asset_value(path)
+        try:
+            mtime = os.stat(resolved).st_mtime
+        except OSError:
+            return 0.0
+        hit = self._audio_len_cache.get(resolved)
+        if hit is not None and hit[0] == mtime:
+            return hit[1]
+        waiting = self._audio_waiting.get(resolved)
+        if waiting is None:
+            waiting = self._audio_waiting[resolved] = []
+            QtCore.QThreadPool.globalInstance().start(partial(self._probe_audio_worker, resolved, mtime))
+        waiting.append(kf.id)
+        return 0.0
+
+    def _probe_audio_worker(self, resolved: str, mtime: float):
+        # runs on a pool thread; the queued signal hands the result back to the model's thread
+        length = 0.0
         try:
             if os.path.isfile(resolved):
-                snd = pygame.mixer.Sound(resolved)
-                return float(snd.get_length())
+                length = _probe_audio_len(resolved)
         except Exception:
             pass
-        return 0.0
+        self._audioLenReady.emit(resolved, mtime, length)
+
+    def _apply_audio_len(self, resolved: str, mtime: float, length: float):
+        waiting = self._audio_waiting.pop(resolved, [])
+        if length <= 0 and waiting:
+            length = _decode_audio_len(resolved)  # no readable header; decode here, not on the worker
+        if length <= 0:
+            return
+        self._audio_len_cache[resolved] = (mtime, length)
+        # not an edit of its own: blocks still at the placeholder just get their real length
+        changed = False
+        for kid in waiting:
+            changed |= self._patch_audio_len(kid, resolved, length)
+        if changed:
+            self.touch(MUSIC, recompute_duration=True)
+
+    def _patch_audio_len(self, kf_id: int, resolved: str, length: float) -> bool:
+        """Set a probed length on MUSIC block kf_id unless it was deleted, pointed at
+        another file or given a duration of its own meanwhile."""
+        kf = self.find_kf(MUSIC, kf_id)
+        if kf is None:
+            return False
+        if kf.data.get(DURATION_KEY) != DEFAULT_TRACK_DURATIONS.get(MUSIC, 0.0):
+            return False
+        if self.resolve_asset_value(str(kf.data.get(VALUE_KEY, ""))) != resolved:
+            return False
+        kf.data[DURATION_KEY] = length
+        return True
 
     # ---- API ----
+    def pin_duration(self, track: str, kf_id: int):
+        """The user set kf_id's duration; a pending audio probe must leave it alone."""
+        if track != MUSIC:
+            return
+        for waiting in self._audio_waiting.values():
+            if kf_id in waiting:
+                waiting.remove(kf_id)
+
     def add_kf(self, track: str, kf: Keyframe, snap: bool = False):
         # ensure bucket exists (defensive against older code)
         self.tracks.setdefault(track, [])
@@ -183,43 +332,65 @@ class TimelineModel(QtCore.QObject):
         # defaults
         if kf.data.get(DURATION_KEY) is None:
             if track == MUSIC:
-                path = str(kf.data.get(VALUE_KEY, ""))
-                length = self._guess_audio_len(path)
+                length = self._guess_audio_len(kf)
                 kf.data[DURATION_KEY] = length if length > 0 else DEFAULT_TRACK_DURATIONS.get(track, 0.0)
             else:
                 kf.data[DURATION_KEY] = DEFAULT_TRACK_DURATIONS.get(track, 0.0)
 
-        self.tracks[track].append(kf)
-        self.tracks[track].sort(key=lambda k: k.t)
+        # after any blocks sharing its start time, as the old append + stable sort did
+        insort_right(self.tracks[track], kf, key=_kf_time)
+        self._by_id[(track, kf.id)] = kf
         end_t = kf.t + self._eff_duration(track, kf)
         self._set_duration(max(self._duration, end_t))
         self.touch(track)
 
     def remove_kf(self, track: str, kf_id: int):
-        arr = self.tracks.get(track, [])
-        new_arr = [k for k in arr if k.id != kf_id]
-        if len(new_arr) == len(arr):
+        if not self._unlink(track, kf_id):
             return
-        self.tracks[track] = new_arr
         self.touch(track, recompute_duration=True)
 
     def find_kf(self, track: str, kf_id: int) -> Optional[Keyframe]:
-        for k in self.tracks.get(track, []):
-            if k.id == kf_id:
-                return k
-        return None
+        return self._by_id.get((track, kf_id))
+
+    def _unlink(self, track: str, kf_id: int) -> bool:
+        """Drop a keyframe from the id index and its track list."""
+        k = self._by_id.pop((track, kf_id), None)
+        if k is None:
+            return False
+        self._track_ends.pop(track, None)
+        arr = self.tracks[track]
+        # lists are kept sorted by t, so start at the first block with k's time
+        i = bisect_left(arr, k.t, key=_kf_time)
+        while i < len(arr) and arr[i] is not k and arr[i].t == k.t:
+            i += 1
+        if i == len(arr) or arr[i] is not k:
+            # list is out of order (mid-drag); fall back to a scan
+            i = next((j for j, other in enumerate(arr) if other is k), None)
+            if i is None:
+                return False  # stale index entry; it is gone now
+        del arr[i]
+        return True
+
+    def track_times(self, track: str) -> List[float]:
+        """Sorted start times of a track's keyframes, cached until the track changes."""
+        times = self._track_times.get(track)
+        if times is None:
+            times = self._track_times[track] = [k.t for k in self.tracks.get(track, [])]
+        return times
+
+    def _drop_track_times(self, track: str):
+        if track == "__all__":
+            self._track_times.clear()
+        else:
+            self._track_times.pop(track, None)
 
     def _eff_duration(self, track: str, k: Keyframe) -> float:
-        base = DEFAULT_TRACK_DURATIONS.get(track, 0.0)
-        d = float(k.data.get(DURATION_KEY, base))
-        if track in (BG, SPRITE, FX, DIALOG, MUSIC, SFX):
-            return max(d, TICK_SEC)
-        if track == MENU:
-            # menus stay modal; ensure a substantial footprint
-            return max(d if d > 0 else base, TICK_SEC)
-        if track == LOGIC:
-            return max(d if d > 0 else base, TICK_SEC)
-        return max(d, TICK_SEC)
+        d = k.data.get(DURATION_KEY)
+        d = DEFAULT_TRACK_DURATIONS.get(track, 0.0) if d is None else float(d)
+        if d <= 0 and track in _MODAL_TRACKS:
+            # menus/logic stay modal; ensure a substantial footprint
+            d = DEFAULT_TRACK_DURATIONS.get(track, 0.0)
+        return d if d > TICK_SEC else TICK_SEC
 
 
     def keyframes_at(self, t0: float, t1: float) -> Iterable[Tuple[str, Keyframe]]:
@@ -227,52 +398,81 @@ class TimelineModel(QtCore.QObject):
         if t1 < t0:
             t0, t1 = t1, t0
         for track, arr in self.tracks.items():
-            for k in arr:
-                if t0 < k.t <= t1:
-                    yield (track, k)
+            # tracks are sorted by t, so only the (t0, t1] window needs visiting
+            lo = bisect_right(arr, t0, key=_kf_time)
+            hi = bisect_right(arr, t1, lo=lo, key=_kf_time)
+            for i in range(lo, hi):
+                yield (track, arr[i])
 
     # ---- serialization ----
     def to_json(self) -> str:
+        return dump_project_json(self._to_doc())
+
+    def to_json_stream(self, fp):
+        """Write the project JSON straight to an open text file (same format as to_json)."""
+        write_project_json(self._to_doc(), fp)
+
+    def _to_doc(self) -> dict:
         doc = {"duration": self.duration, "tracks": {}}
         for tr, arr in self.tracks.items():
             serialized = []
             for k in arr:
-                data = dict(k.data)
+                # the keyframe keeps the normalized value too, so its dict can be
+                # serialized as-is instead of copied
+                data = k.data
                 val = data.get("value")
                 if isinstance(val, str):
-                    normalized = self.normalize_asset_value(val)
-                    data["value"] = normalized
-                    k.data["value"] = normalized
+                    data["value"] = self.normalize_asset_value(val)
                 serialized.append({"t": k.t, "track": k.track, "data": data, "id": k.id})
             doc["tracks"][tr] = serialized
-        return json.dumps(doc, indent=2)
+        return doc
 
     def load_json(self, s: str, project_file: Optional[str] = None):
-        doc = json.loads(s or "{}")
+        self._load_doc(load_project_json(s or "{}"), project_file)
+
+    def load_json_stream(self, fp, project_file: Optional[str] = None):
+        """Load a project from an open text file (see load_json)."""
+        self._load_doc(load_project_json(fp.read()), project_file)
+
+    def _load_doc(self, doc: dict, project_file: Optional[str] = None):
         if project_file is None:
             project_file = doc.get("projectFile")
+        if (Path(project_file) if project_file else None) != self._project_file:
+            # ids only mean something within one project; the probes may still finish
+            for waiting in self._audio_waiting.values():
+                waiting.clear()
         self.set_project_file(project_file)
         self._duration = float(doc.get("duration", 60.0))
         # start with all known tracks
         self.tracks = {name: [] for name in TRACKS}
+        self._by_id = {}
+        self._track_ends = {}
         self._next_id = 1
 
+        # doc is always freshly parsed, so its data dicts are ours to keep
+        by_id = self._by_id
+        renumber: List[Keyframe] = []  # no id, or one already taken on its track
         for tr, arr in (doc.get("tracks", {}) or {}).items():
-            bucket = self.tracks.setdefault(tr, [])
+            bucket = []
             for it in (arr or []):
-                data = dict(it.get("data", {}))
+                data = it.get("data") or {}
                 val = data.get("value")
                 if isinstance(val, str):
-                    normalized = self.normalize_asset_value(val)
-                    data["value"] = normalized
+                    data["value"] = self.normalize_asset_value(val)
                 k = Keyframe(float(it.get("t", 0.0)), tr, data, int(it.get("id", -1)))
-                if k.id < 0:
-                    k.id = self._next_id
-                    self._next_id += 1
+                if k.id < 0 or (tr, k.id) in by_id:
+                    renumber.append(k)
                 else:
                     self._next_id = max(self._next_id, k.id + 1)
+                    by_id[(tr, k.id)] = k
                 bucket.append(k)
-            bucket.sort(key=lambda m: m.t)
+            bucket.sort(key=_kf_time)
+            self.tracks[tr] = bucket
+        # fresh ids only once every stored one is known, so they can't collide
+        for k in renumber:
+            k.id = self._next_id
+            self._next_id += 1
+            by_id[(k.track, k.id)] = k
 
         # make sure any newly added tracks (future) exist
         for name in TRACKS:
@@ -288,11 +488,8 @@ class TimelineModel(QtCore.QObject):
         removed = 0
         dirty_tracks: set[str] = set()
         for track, kid in items:
-            arr = self.tracks.get(track, [])
-            new_arr = [k for k in arr if getattr(k, "id", None) != kid]
-            removed += len(arr) - len(new_arr)
-            if len(new_arr) != len(arr):
-                self.tracks[track] = new_arr
+            if self._unlink(track, kid):
+                removed += 1
                 dirty_tracks.add(track)
         if removed:
             self._recompute_duration()
@@ -1,7 +1,16 @@
 from __future__ import annotations
+import gzip
+import json
 from pathlib import Path
+from typing import Optional
+
+try:
+    import orjson  # optional: much faster project (de)serialization
+except ImportError:
+    orjson = None
 
 PROJECTS_ROOT = Path.cwd() / "projects"
+COMPRESSED_SUFFIX = ".vngenz"  # gzip-compressed project JSON; .json stays plain for diffing
 
 def ensure_project_structure(project_file: str | Path) -> Path:
     """
@@ -14,6 +23,46 @@ def ensure_project_structure(project_file: str | Path) -> Path:
         (path.parent / sub).mkdir(parents=True, exist_ok=True)
     return path
 
+def is_compressed_project(project_file: str | Path) -> bool:
+    return Path(project_file).suffix.lower() == COMPRESSED_SUFFIX
+
+def open_project_file(project_file: str | Path, mode: str = "r"):
+    """Open a project file as UTF-8 text ("r" or "w"), through gzip for .vngenz files."""
+    if is_compressed_project(project_file):
+        # level 1 keeps most of the size win for a fraction of the default level's CPU time
+        return gzip.open(project_file, mode + "t", encoding="utf-8", compresslevel=1)
+    return open(project_file, mode, encoding="utf-8")
+
+def load_project_json(text: str | bytes) -> dict:
+    """Parse project JSON, through orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass  # NaN/Infinity or huge ints: only the stdlib parser accepts those
+    return json.loads(text)
+
+def _orjson_text(doc: dict) -> Optional[str]:
+    if orjson is None:
+        return None
+    try:
+        return orjson.dumps(doc, option=orjson.OPT_INDENT_2).decode()
+    except orjson.JSONEncodeError:
+        return None  # non-str keys, ints past 64 bits...: leave those to the stdlib encoder
+
+def dump_project_json(doc: dict) -> str:
+    """doc as indent-2 JSON text."""
+    text = _orjson_text(doc)
+    return text if text is not None else json.dumps(doc, indent=2)
+
+def write_project_json(doc: dict, fp):
+    """Write doc to an open text file, in the same format as dump_project_json."""
+    text = _orjson_text(doc)
+    if text is not None:
+        fp.write(text)
+    else:
+        json.dump(doc, fp, indent=2)
+
 def default_projects_root() -> Path:
     PROJECTS_ROOT.mkdir(parents=True, exist_ok=True)
     return PROJECTS_ROOT
@@ -1,5 +1,6 @@
 from __future__ import annotations
 from PySide6 import QtCore, QtGui, QtWidgets
+from widgets_common import color_validator
 
 # --- tiny editor dialog for DIALOG keyframes --------------------------------
 class _DialogEditor(QtWidgets.QDialog):
@@ -77,6 +78,7 @@ class _FxEditor(QtWidgets.QDialog):
         self.spFrom.setValue(float(d.get("from_alpha", d.get("from", 0.0))))
         self.spTo.setValue(float(d.get("to_alpha", d.get("to", 1.0))))
         self.edColor = QtWidgets.QLineEdit(str(d.get("color", "#000000")), self)
+        self.edColor.setValidator(color_validator())
 
         # Shake fields
         self.spAmp  = QtWidgets.QDoubleSpinBox(self); self.spAmp .setRange(0.0, 200.0); self.spAmp .setDecimals(1)
@@ -100,14 +102,21 @@ class _FxEditor(QtWidgets.QDialog):
         form.addRow("Decay", self.spDecay)
         form.addRow("Seed", self.spSeed)
 
-        # Enable/disable groups based on mode
+        # Enable/disable groups based on mode; only touch widgets when a group flips
+        self._fade_widgets = (self.spFrom, self.spTo, self.edColor)
+        self._shake_widgets = (self.spAmp, self.spFreq, self.spDecay, self.spSeed)
+        self._fields_state = None
+
         def _refresh_fields():
             m = self.cmbMode.currentText()
-            fade_on = (m in ("black", "white", "translucent"))
-            shake_on = (m == "shake")
-            for w in (self.spFrom, self.spTo, self.edColor):
+            state = (m in ("black", "white", "translucent"), m == "shake")
+            if state == self._fields_state:
+                return
+            self._fields_state = state
+            fade_on, shake_on = state
+            for w in self._fade_widgets:
                 w.setEnabled(fade_on)
-            for w in (self.spAmp, self.spFreq, self.spDecay, self.spSeed):
+            for w in self._shake_widgets:
                 w.setEnabled(shake_on)
 
         self.cmbMode.currentTextChanged.connect(lambda _: _refresh_fields())
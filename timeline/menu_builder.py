@@ -3,6 +3,7 @@ from pathlib import Path
 from typing import Callable, Optional, List
 from PySide6 import QtCore, QtWidgets
 from model import TimelineModel
+from widgets_common import MenuOptionsModel
 from menu_palettes import MENU_PALETTES, DEFAULT_MENU_PALETTE
 
 
@@ -62,10 +63,11 @@ class MenuBuilderDialog(QtWidgets.QDialog):
         bg_opacity_row.addWidget(self.backgroundOpacity)
         layout.addLayout(bg_opacity_row)
 
-        self.table = QtWidgets.QTableWidget(0, 3)
-        self.table.setHorizontalHeaderLabels(
-            ["Text", "Target (label or seconds)", "Script Asset (optional)"]
+        self.options = MenuOptionsModel(
+            self, headers=("Text", "Target (label or seconds)", "Script Asset (optional)")
         )
+        self.table = QtWidgets.QTableView()
+        self.table.setModel(self.options)
         self.table.horizontalHeader().setStretchLastSection(True)
         self.table.verticalHeader().setVisible(False)
         self.table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
@@ -107,7 +109,7 @@ class MenuBuilderDialog(QtWidgets.QDialog):
         self.btnPickBackground.clicked.connect(self._pick_background)
         self.btnCancel.clicked.connect(self.reject)
         self.btnOk.clicked.connect(self._accept)
-        self.table.itemSelectionChanged.connect(self._update_button_states)
+        self.table.selectionModel().currentRowChanged.connect(self._update_button_states)
 
         # Seed with two basic options
         self._add_option("Continue", "", "")
@@ -134,39 +136,31 @@ class MenuBuilderDialog(QtWidgets.QDialog):
         self.accept()
 
     def _add_option(self, text: str = "", target: str = "", script: str = ""):
-        row = self.table.rowCount()
-        self.table.insertRow(row)
-        for col, value in enumerate((text or "Option", target, script)):
-            item = QtWidgets.QTableWidgetItem(value)
-            self.table.setItem(row, col, item)
+        row = self.options.append_row((text or "Option", target, script))
         self.table.selectRow(row)
         self._update_button_states()
 
     def _remove_option(self):
-        row = self.table.currentRow()
+        row = self._current_row()
         if row >= 0:
-            self.table.removeRow(row)
+            self.options.removeRow(row)
             if row > 0:
                 self.table.selectRow(row - 1)
         self._update_button_states()
 
     def _move_option(self, delta: int):
-        row = self.table.currentRow()
+        row = self._current_row()
         if row < 0:
             return
         new_row = row + delta
-        if not (0 <= new_row < self.table.rowCount()):
+        if not (0 <= new_row < self.options.rowCount()):
             return
-        for col in range(self.table.columnCount()):
-            cur = self.table.item(row, col).text() if self.table.item(row, col) else ""
-            nxt = self.table.item(new_row, col).text() if self.table.item(new_row, col) else ""
-            self.table.item(row, col).setText(nxt)
-            self.table.item(new_row, col).setText(cur)
+        self.options.swap_rows(row, new_row)
         self.table.selectRow(new_row)
         self._update_button_states()
 
     def _link_script(self):
-        row = self.table.currentRow()
+        row = self._current_row()
         if row < 0:
             return
         base = str((self._model.asset_root / "scripts").resolve())
@@ -182,7 +176,7 @@ class MenuBuilderDialog(QtWidgets.QDialog):
         self._update_button_states()
 
     def _edit_script(self):
-        row = self.table.currentRow()
+        row = self._current_row()
         if row < 0:
             return
         existing = self._row_value(row, 2)
@@ -214,10 +208,8 @@ class MenuBuilderDialog(QtWidgets.QDialog):
     # ----- helpers -----
     def _collect_options(self) -> List[dict]:
         options: List[dict] = []
-        for row in range(self.table.rowCount()):
-            text = self._row_value(row, 0)
-            target = self._row_value(row, 1)
-            script = self._row_value(row, 2)
+        for text, target, script in self.options.rows():
+            text, target, script = text.strip(), target.strip(), script.strip()
             if not text:
                 continue
             entry = {"text": text}
@@ -237,22 +229,22 @@ class MenuBuilderDialog(QtWidgets.QDialog):
         except Exception:
             return raw
 
+    def _current_row(self) -> int:
+        return self.table.currentIndex().row()
+
     def _row_value(self, row: int, col: int) -> str:
-        item = self.table.item(row, col)
-        return item.text().strip() if item else ""
+        return self.options.rows()[row][col].strip()
 
     def _set_row_value(self, row: int, col: int, value: str):
-        if not self.table.item(row, col):
-            self.table.setItem(row, col, QtWidgets.QTableWidgetItem(value))
-        else:
-            self.table.item(row, col).setText(value)
+        self.options.setData(self.options.index(row, col), value)
 
     def _update_button_states(self):
-        has_rows = self.table.rowCount() > 0
-        row = self.table.currentRow()
+        count = self.options.rowCount()
+        has_rows = count > 0
+        row = self._current_row()
         self.btnRemove.setEnabled(has_rows and row >= 0)
         self.btnUp.setEnabled(row > 0)
-        self.btnDown.setEnabled(has_rows and 0 <= row < self.table.rowCount() - 1)
+        self.btnDown.setEnabled(has_rows and 0 <= row < count - 1)
         self.btnLinkScript.setEnabled(row >= 0)
         self.btnEditScript.setEnabled(row >= 0)
 
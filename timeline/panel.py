@@ -1,4 +1,5 @@
 from __future__ import annotations
+from functools import partial
 from PySide6 import QtCore, QtGui, QtWidgets
 from model import TimelineModel
 from .view import TimelineView
@@ -54,8 +55,8 @@ class TimelinePanel(QtWidgets.QWidget):
         lay.addWidget(self.scroll, 1)
 
         # Signals
-        actZoomOut.triggered.connect(lambda: self._nudge_zoom(-SEC_PX_STEP))
-        actZoomIn.triggered.connect(lambda: self._nudge_zoom(+SEC_PX_STEP))
+        actZoomOut.triggered.connect(partial(self.adjust_zoom, -SEC_PX_STEP))
+        actZoomIn.triggered.connect(partial(self.adjust_zoom, +SEC_PX_STEP))
         self.zoomSlider.valueChanged.connect(self._apply_slider_zoom)
 
         # Bubble up selChanged
@@ -95,6 +96,12 @@ class TimelinePanel(QtWidgets.QWidget):
         self.zoomSlider.blockSignals(False)
         self._refresh_geometry()
 
+    def adjust_zoom(self, delta: float):
+        px = max(float(SEC_PX_MIN), min(float(SEC_PX_MAX), self.view.sec_to_px() + float(delta)))
+        if px == self.view.sec_to_px():
+            return  # already at the limit; skip the relayout
+        self.set_zoom_px_per_sec(px)
+
     def center_on_time(self, t: float):
         self.view.center_on_time(t, self.scroll)
 
@@ -106,9 +113,6 @@ class TimelinePanel(QtWidgets.QWidget):
         self.view.set_zoom_px_per_sec(float(val))
         self._refresh_geometry()
 
-    def _nudge_zoom(self, delta: float):
-        self.set_zoom_px_per_sec(self.view.sec_to_px() + delta)
-
     def _refresh_geometry(self):
         # Force the scroll area to re-measure the canvas
         self.view.updateGeometry()
@@ -314,6 +314,7 @@ class TimelineView(QtWidgets.QWidget):
                 new_end = max(k.t + 0.05, t)
                 dur = new_end - k.t
                 k.data["duration"] = float(dur)
+                self.model.pin_duration(tr, k.id)
                 self._maybe_transition(tr)
             self.model.touch(tr, recompute_duration=True)
             self.update()
@@ -457,6 +458,7 @@ class TimelineView(QtWidgets.QWidget):
                 new_dur = max(TICK_SEC, cut_time - k.t)
                 k.data = dict(k.data or {})
                 k.data["duration"] = float(new_dur)
+                self.model.pin_duration(tr, k.id)
                 self.model.touch(tr, recompute_duration=True)
                 self.update()
         elif action == actEditDialog and hit and hit[0] == "DIALOG":
@@ -591,18 +593,19 @@ class TimelineView(QtWidgets.QWidget):
             paths = [u.toLocalFile() for u in e.mimeData().urls()]
 
         added_any = False
-        for p in paths:
-            if not p:
-                continue
-            data = {"value": p}
-            if tr in ("SPRITE", "FX"):
-                data.update({"x": 0.5, "y": 0.62, "w": 0.26, "h": 0.46, "opacity": 1.0, "duration": 1.0})
-            self.model.add_kf(tr, Keyframe(t, tr, data), snap=True)
-            t += 0.1  # slight offset if dropping many
-            added_any = True
-        if added_any:
-            self._maybe_transition(tr)
-            self.model.touch(tr)
+        with self.model.batch():  # one round of change signals for the whole drop
+            for p in paths:
+                if not p:
+                    continue
+                data = {"value": p}
+                if tr in ("SPRITE", "FX"):
+                    data.update({"x": 0.5, "y": 0.62, "w": 0.26, "h": 0.46, "opacity": 1.0, "duration": 1.0})
+                self.model.add_kf(tr, Keyframe(t, tr, data), snap=True)
+                t += 0.1  # slight offset if dropping many
+                added_any = True
+            if added_any:
+                self._maybe_transition(tr)
+                self.model.touch(tr)
         self.update()
 
     # ------------- viewport helpers -------------
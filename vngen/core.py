@@ -1,10 +1,32 @@
 # core.py — low-level pygame render engine (no Qt, no model)
 from __future__ import annotations
+import os
+import re
+from bisect import bisect_left
+from collections import OrderedDict
 import pygame
 from typing import Optional, Tuple, List
 from .transitions import overlay_fade
 from .effects import shake_offset
 
+_IMG_CACHE_MAX = 64
+_SCALED_CACHE_MAX = 16
+_OPAQUE_EXTS = (".jpg", ".jpeg", ".bmp")
+_TEXT_CACHE_MAX = 256
+_DLG_BOX_RATIO = 0.20
+_MENU_PAD = 18
+_MENU_BTN_H = 34
+_WORD_RE = re.compile(r"\S+")
+
+_ALIGN_TABLE: dict[str, tuple[float, float]] = {
+    "center": (0.5, 0.5),
+    "left": (0.0, 0.5), "right": (1.0, 0.5),
+    "top": (0.5, 0.0), "bottom": (0.5, 1.0),
+    "top-left": (0.0, 0.0), "top-right": (1.0, 0.0),
+    "bottom-left": (0.0, 1.0), "bottom-right": (1.0, 1.0),
+}
+_ALIGN_CACHE: dict[str, tuple[float, float]] = {}  # raw align string -> (ax, ay)
+
 
 class GameCore:
     """Stateless-per-frame renderer. Higher layers set state every frame."""
@@ -22,6 +44,8 @@ class GameCore:
         self.bg_prev: Optional[pygame.Surface] = None
         self.bg_xfade: float = 0.0
         self.bg_xstart: float = 0.0
+        self._bg_path: Optional[str] = None
+        self._bg_prev_path: Optional[str] = None
 
         # Background sizing behavior
         self.bg_fit: str = "cover"     # cover | contain | stretch | native
@@ -35,9 +59,13 @@ class GameCore:
         self.spr_xstart: float = 0.0
         self.spr_rect = pygame.Rect(int(w * 0.37), int(h * 0.28), int(w * 0.26), int(h * 0.46))
         self.spr_opacity: float = 1.0
+        self._spr_path: Optional[str] = None
+        self._spr_prev_path: Optional[str] = None
 
         # Dialog
         self.dialog = {"speaker": "", "text": "", "cps": 24.0, "start": -1.0, "end": -1.0}
+        # Wrapped layout of the full dialog text: ((text, wmax), lines, line_starts, line_spans)
+        self._dlg_layout: Optional[tuple] = None
 
         # FX overlay (scene fades)
         self.fx_mode: Optional[str] = None              # "black" | "white" | "translucent" | None
@@ -62,7 +90,41 @@ class GameCore:
         self.menu_hover_idx: int = -1
         self.menu_layout: List[pygame.Rect] = []  # computed each frame
 
-    # -------- platform quirk: need a display surface for convert_alpha()
+        # Decoded image cache: path -> (mtime, surface), oldest evicted first
+        self._img_cache: OrderedDict[str, tuple[float, pygame.Surface]] = OrderedDict()
+        # Scaled surface cache: (id(src), w, h, mode, align, zoom) -> (src, (surface, topleft));
+        # holding src keeps its id from being reused by a newer surface while the entry lives
+        self._scaled_cache: dict[tuple, tuple[pygame.Surface, tuple[pygame.Surface, tuple[int, int]]]] = {}
+        # Font caches: (text, color) -> rendered line, (text, wmax) -> wrapped lines
+        self._text_cache: OrderedDict[tuple[str, tuple], pygame.Surface] = OrderedDict()
+        self._wrap_cache: OrderedDict[tuple[str, int], List[str]] = OrderedDict()
+
+        # Persistent per-frame buffers (world layer, composited frame, FX overlay)
+        self._alloc_buffers()
+
+    def _alloc_buffers(self):
+        size = (self.w, self.h)
+        self._s_world = pygame.Surface(size, flags=pygame.SRCALPHA)
+        self._s_final = pygame.Surface(size, flags=pygame.SRCALPHA)
+        self._fx_scratch = pygame.Surface(size, flags=pygame.SRCALPHA)
+        # Pre-filled translucent box fills for the dialog/menu overlays
+        self._dlg_rect = pygame.Rect(0, int(self.h * (1.0 - _DLG_BOX_RATIO)), self.w, int(self.h * _DLG_BOX_RATIO))
+        self._dlg_bg = self._box_surface(self._dlg_rect.size, (18, 18, 22, 190))
+        panel_h = int(self.h * 0.35)
+        self._menu_rect = pygame.Rect(int(self.w * 0.08), int(self.h * 0.5 - panel_h / 2),
+                                      int(self.w * 0.84), panel_h)
+        self._menu_bg = self._box_surface(self._menu_rect.size, (16, 18, 24, 210))
+        btn_size = (self._menu_rect.width - _MENU_PAD * 2, _MENU_BTN_H)
+        self._menu_btn_idle = self._box_surface(btn_size, (44, 48, 60, 160))
+        self._menu_btn_hover = self._box_surface(btn_size, (70, 100, 255, 90))
+
+    @staticmethod
+    def _box_surface(size: tuple[int, int], rgba: Tuple[int, int, int, int]) -> pygame.Surface:
+        surf = pygame.Surface((max(1, size[0]), max(1, size[1])), flags=pygame.SRCALPHA)
+        surf.fill(rgba)
+        return surf.premul_alpha()
+
+    # -------- platform quirk: need a display surface for convert()/convert_alpha()
     def _ensure_display(self):
         if not pygame.display.get_init():
             pygame.display.init()
@@ -76,16 +138,111 @@ class GameCore:
     def _load_image(self, path: Optional[str]) -> Optional[pygame.Surface]:
         if not path:
             return None
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            mtime = -1.0
+        hit = self._img_cache.get(path)
+        if hit is not None and hit[0] == mtime:
+            self._img_cache.move_to_end(path)
+            return hit[1]
         try:
             self._ensure_display()
-            return pygame.image.load(path).convert_alpha()
+            raw = pygame.image.load(path)
+            # opaque sources take SDL's fast non-alpha blit path
+            if path.lower().endswith(_OPAQUE_EXTS) or not (raw.get_flags() & pygame.SRCALPHA):
+                surf = raw.convert()
+            else:
+                surf = raw.convert_alpha()
         except Exception as e:
             print("[IMG] fail:", path, e)
             return None
+        self._img_cache[path] = (mtime, surf)
+        self._img_cache.move_to_end(path)
+        while len(self._img_cache) > _IMG_CACHE_MAX:
+            self._img_cache.popitem(last=False)
+        return surf
+
+    # -------- text helpers (memoized font work)
+    def _render_line(self, text: str, color: Tuple[int, int, int]) -> pygame.Surface:
+        key = (text, color)
+        surf = self._text_cache.get(key)
+        if surf is None:
+            surf = self.ui_font.render(text, True, color)
+            self._text_cache[key] = surf
+            if len(self._text_cache) > _TEXT_CACHE_MAX:
+                self._text_cache.popitem(last=False)
+        else:
+            self._text_cache.move_to_end(key)
+        return surf
+
+    def _wrap(self, text: str, wmax: int) -> List[str]:
+        key = (text, wmax)
+        lines = self._wrap_cache.get(key)
+        if lines is not None:
+            self._wrap_cache.move_to_end(key)
+            return lines
+        cur_line = ""
+        lines = []
+        for w in text.split():
+            test = (cur_line + " " + w).strip()
+            if self.ui_font.size(test)[0] <= wmax:
+                cur_line = test
+            else:
+                if cur_line:
+                    lines.append(cur_line)
+                cur_line = w
+        if cur_line:
+            lines.append(cur_line)
+        self._wrap_cache[key] = lines
+        if len(self._wrap_cache) > _TEXT_CACHE_MAX:
+            self._wrap_cache.popitem(last=False)
+        return lines
+
+    def _dialog_layout(self, text: str, wmax: int) -> tuple[List[str], List[int], List[List[tuple[int, int]]]]:
+        """Wrap the full dialog once; return lines, each line's first char offset, and word spans."""
+        key = (text, wmax)
+        if self._dlg_layout is not None and self._dlg_layout[0] == key:
+            return self._dlg_layout[1:]
+        spans = [m.span() for m in _WORD_RE.finditer(text)]
+        lines = self._wrap(text, wmax)
+        starts: List[int] = []
+        line_spans: List[List[tuple[int, int]]] = []
+        i = 0
+        for ln in lines:
+            n_words = len(ln.split())
+            words = spans[i:i + n_words]
+            i += n_words
+            starts.append(words[0][0])
+            line_spans.append(words)
+        self._dlg_layout = (key, lines, starts, line_spans)
+        return lines, starts, line_spans
+
+    def _typed_lines(self, text: str, wmax: int, n: int) -> List[str]:
+        """Lines of the full-text layout with only the first *n* characters typed."""
+        lines, starts, line_spans = self._dialog_layout(text, wmax)
+        shown = bisect_left(starts, n)  # lines whose first char is already typed
+        if shown == 0:
+            return []
+        out = lines[:shown - 1]
+        words = line_spans[shown - 1]
+        if words[-1][1] <= n:
+            out.append(lines[shown - 1])
+        else:
+            out.append(" ".join(text[a:min(b, n)] for a, b in words if a < n))
+        return out
 
     # -------- align + scaling helpers (flexible bg sizing)
     def _parse_align(self, align: str) -> tuple[float, float]:
-        a = (align or "center").lower().replace("_", "-").strip()
+        hit = _ALIGN_CACHE.get(align)
+        if hit is None:
+            a = (align or "center").lower().replace("_", "-").strip()
+            hit = _ALIGN_TABLE.get(a) or self._parse_align_slow(a)
+            _ALIGN_CACHE[align] = hit
+        return hit
+
+    @staticmethod
+    def _parse_align_slow(a: str) -> tuple[float, float]:
         ax, ay = 0.5, 0.5
         if "left" in a: ax = 0.0
         if "right" in a: ax = 1.0
@@ -97,13 +254,43 @@ class GameCore:
         if a == "bottom": ay = 1.0
         return ax, ay
 
+    def _cache_scaled(self, key: tuple, src: pygame.Surface, value: tuple[pygame.Surface, tuple[int, int]]):
+        cache = self._scaled_cache
+        if len(cache) >= _SCALED_CACHE_MAX:
+            live = {id(s) for s in (self.bg_img, self.bg_prev, self.spr_img, self.spr_prev) if s is not None}
+            for k in [k for k in cache if k[0] not in live]:
+                del cache[k]
+            while len(cache) >= _SCALED_CACHE_MAX:
+                del cache[next(iter(cache))]
+        cache[key] = (src, value)
+
+    def _get_scaled(self, img: pygame.Surface, w: int, h: int) -> pygame.Surface:
+        key = (id(img), w, h, "size", "", 1.0)
+        hit = self._scaled_cache.get(key)
+        if hit is not None and hit[0] is img:
+            return hit[1][0]
+        scaled = pygame.transform.smoothscale(img, (w, h))
+        self._cache_scaled(key, img, (scaled, (0, 0)))
+        return scaled
+
     def _scale_and_position(self, img: pygame.Surface, *,
                             mode: str = "cover",
                             align: str = "center",
                             zoom: float = 1.0) -> tuple[pygame.Surface, tuple[int, int]]:
+        zoom = max(0.01, float(zoom))
+        key = (id(img), self.w, self.h, mode, align, zoom)
+        hit = self._scaled_cache.get(key)
+        if hit is not None and hit[0] is img:
+            return hit[1]
+        result = self._scale_and_position_uncached(img, mode=mode, align=align, zoom=zoom)
+        self._cache_scaled(key, img, result)
+        return result
+
+    def _scale_and_position_uncached(self, img: pygame.Surface, *,
+                                     mode: str, align: str,
+                                     zoom: float) -> tuple[pygame.Surface, tuple[int, int]]:
         iw, ih = img.get_width(), img.get_height()
         dw, dh = self.w, self.h
-        zoom = max(0.01, float(zoom))
 
         if mode == "stretch":
             nw, nh = max(1, int(dw * zoom)), max(1, int(dh * zoom))
@@ -133,9 +320,8 @@ class GameCore:
                  offset: tuple[int, int] = (0, 0),
                  mode: str = "cover", align: str = "center", zoom: float = 1.0):
         scaled, (x, y) = self._scale_and_position(img, mode=mode, align=align, zoom=zoom)
-        if alpha is not None:
-            scaled = scaled.copy()
-            scaled.set_alpha(alpha)
+        # scaled surfaces are cached and shared, so (re)set the alpha on every blit
+        scaled.set_alpha(alpha)
         ox, oy = offset
         s.blit(scaled, (x + int(ox), y + int(oy)))
 
@@ -143,8 +329,12 @@ class GameCore:
     def set_backgrounds_ex(self, current_path: Optional[str], prev_path: Optional[str],
                            xfade: float, xstart: float, *,
                            fit: str = "cover", align: str = "center", zoom: float = 1.0):
-        self.bg_img  = self._load_image(current_path)
-        self.bg_prev = self._load_image(prev_path)
+        if current_path != self._bg_path:
+            self.bg_img = self._load_image(current_path)
+            self._bg_path = current_path
+        if prev_path != self._bg_prev_path:
+            self.bg_prev = self._load_image(prev_path)
+            self._bg_prev_path = prev_path
         self.bg_xfade, self.bg_xstart = max(0.0, xfade), float(xstart)
         self.bg_fit   = (fit or "cover").lower()
         self.bg_align = align or "center"
@@ -162,19 +352,27 @@ class GameCore:
         # current_desc / prev_desc: (path, rect, opacity)
         if current_desc:
             p, r, op = current_desc
-            self.spr_img = self._load_image(p)
+            if p != self._spr_path:
+                self.spr_img = self._load_image(p)
+                self._spr_path = p
             self.spr_rect = r
             self.spr_opacity = max(0.0, min(1.0, op))
         else:
             self.spr_img = None
+            self._spr_path = None
         if prev_desc:
             p2, _r2, _op2 = prev_desc
-            self.spr_prev = self._load_image(p2)
+            if p2 != self._spr_prev_path:
+                self.spr_prev = self._load_image(p2)
+                self._spr_prev_path = p2
         else:
             self.spr_prev = None
+            self._spr_prev_path = None
         self.spr_xfade, self.spr_xstart = max(0.0, xfade), float(xstart)
 
     def set_dialog(self, speaker: str, text: str, cps: float, t_start: float, t_end: float):
+        if (text or "") != self.dialog["text"]:
+            self._dlg_layout = None
         self.dialog.update({"speaker": speaker or "", "text": text or "", "cps": max(1.0, cps),
                             "start": t_start, "end": t_end})
 
@@ -213,8 +411,10 @@ class GameCore:
 
     # -------- single-frame render (stateless apart from fields above)
     def render_surface(self, playhead: float) -> pygame.Surface:
-        s_world = pygame.Surface((self.w, self.h), flags=pygame.SRCALPHA)
-        s_final = pygame.Surface((self.w, self.h), flags=pygame.SRCALPHA)
+        s_world = self._s_world
+        s_world.fill((0, 0, 0, 0))
+        s_final = self._s_final
+        s_final.fill((0, 0, 0, 0))
 
         # screen shake offset
         shake_xy = (0, 0)
@@ -231,9 +431,10 @@ class GameCore:
                 (self.bg_xstart <= playhead <= self.bg_xstart + self.bg_xfade)):
                 t = (playhead - self.bg_xstart) / max(1e-6, self.bg_xfade)
                 t = max(0.0, min(1.0, t))
-                self._blit_bg(s_world, self.bg_prev, alpha=int(255 * (1.0 - t)),
+                a_in = int(255 * t)
+                self._blit_bg(s_world, self.bg_prev, alpha=255 - a_in,
                               offset=shake_xy, mode=self.bg_fit, align=self.bg_align, zoom=self.bg_zoom)
-                self._blit_bg(s_world, self.bg_img,  alpha=int(255 * t),
+                self._blit_bg(s_world, self.bg_img,  alpha=a_in,
                               offset=shake_xy, mode=self.bg_fit, align=self.bg_align, zoom=self.bg_zoom)
             else:
                 self._blit_bg(s_world, self.bg_img,
@@ -243,22 +444,21 @@ class GameCore:
 
         # Sprite (with crossfade + opacity)
         if self.spr_img:
-            cur = pygame.transform.smoothscale(self.spr_img, (self.spr_rect.width, self.spr_rect.height))
-            if self.spr_opacity < 1.0:
-                cur = cur.copy()
-                cur.set_alpha(int(self.spr_opacity * 255))
+            cur = self._get_scaled(self.spr_img, self.spr_rect.width, self.spr_rect.height)
             topleft = (self.spr_rect.x + int(shake_xy[0]), self.spr_rect.y + int(shake_xy[1]))
             if (self.spr_prev and self.spr_xfade > 0.0 and
                 (self.spr_xstart <= playhead <= self.spr_xstart + self.spr_xfade)):
                 t = (playhead - self.spr_xstart) / max(1e-6, self.spr_xfade)
                 t = max(0.0, min(1.0, t))
-                prev = pygame.transform.smoothscale(self.spr_prev, (self.spr_rect.width, self.spr_rect.height))
-                prev.set_alpha(int(255 * (1.0 - t)))
-                cur2 = cur.copy()
-                cur2.set_alpha(int(255 * t))
+                a_in = int(255 * t)
+                # prev/cur may be the same cached surface: set alpha right before each blit
+                prev = self._get_scaled(self.spr_prev, self.spr_rect.width, self.spr_rect.height)
+                prev.set_alpha(255 - a_in)
                 s_world.blit(prev, topleft)
-                s_world.blit(cur2, topleft)
+                cur.set_alpha(a_in)
+                s_world.blit(cur, topleft)
             else:
+                cur.set_alpha(int(self.spr_opacity * 255) if self.spr_opacity < 1.0 else None)
                 s_world.blit(cur, topleft)
 
         # Copy world
@@ -270,79 +470,62 @@ class GameCore:
             if 0.0 <= t <= 1.0:
                 alpha = (1.0 - t) * self.fx_from + t * self.fx_to
                 if self.fx_mode == "black":
-                    overlay_fade(s_final, (0, 0, 0), alpha)
+                    overlay_fade(s_final, (0, 0, 0), alpha, self._fx_scratch)
                 elif self.fx_mode == "white":
-                    overlay_fade(s_final, (255, 255, 255), alpha)
+                    overlay_fade(s_final, (255, 255, 255), alpha, self._fx_scratch)
                 elif self.fx_mode == "translucent":
-                    overlay_fade(s_final, self.fx_color, alpha)
+                    overlay_fade(s_final, self.fx_color, alpha, self._fx_scratch)
 
         # Dialog
         active = (0 <= self.dialog["start"] <= playhead <= self.dialog["end"]
                   and (self.dialog["speaker"] or self.dialog["text"]))
         if active:
-            box_h_ratio = 0.20
-            dlg_rect = pygame.Rect(0, int(self.h * (1.0 - box_h_ratio)), self.w, int(self.h * box_h_ratio))
-            pygame.draw.rect(s_final, (18, 18, 22, 190), dlg_rect)
+            dlg_rect = self._dlg_rect
+            s_final.blit(self._dlg_bg, dlg_rect.topleft, special_flags=pygame.BLEND_PREMULTIPLIED)
             pygame.draw.rect(s_final, (200, 210, 255, 230), dlg_rect, 2)
 
             cps = self.dialog["cps"]
             n = int(max(0.0, (playhead - self.dialog["start"])) * cps)
             full = self.dialog["text"]
-            typed_txt = full[:min(len(full), n)]
 
             pad = 24
             y0 = dlg_rect.top + 10
             if self.dialog["speaker"]:
-                nm = self.ui_font.render(self.dialog["speaker"] + ":", True, (230, 235, 255))
+                nm = self._render_line(self.dialog["speaker"] + ":", (230, 235, 255))
                 s_final.blit(nm, (pad, y0))
                 y0 += nm.get_height() + 4
 
-            if typed_txt:
-                wmax = self.w - pad * 2
-                words = typed_txt.split()
-                cur_line = ""
-                lines: List[str] = []
-                for w in words:
-                    test = (cur_line + " " + w).strip()
-                    if self.ui_font.size(test)[0] <= wmax:
-                        cur_line = test
-                    else:
-                        if cur_line:
-                            lines.append(cur_line)
-                        cur_line = w
-                if cur_line:
-                    lines.append(cur_line)
+            if full and n > 0:
+                lines = self._typed_lines(full, self.w - pad * 2, n)
                 y = y0
                 for ln in lines[:4]:
-                    surf = self.ui_font.render(ln, True, (235, 240, 255))
+                    surf = self._render_line(ln, (235, 240, 255))
                     s_final.blit(surf, (pad, y))
                     y += surf.get_height() + 4
 
         # --- Menu overlay (drawn above dialog/UI) ---
         if self.menu_active and self.menu_options:
-            panel_h = int(self.h * 0.35)
-            panel = pygame.Rect(int(self.w*0.08), int(self.h*0.5 - panel_h/2),
-                                int(self.w*0.84), panel_h)
-            pygame.draw.rect(s_final, (16, 18, 24, 210), panel)
+            panel = self._menu_rect
+            s_final.blit(self._menu_bg, panel.topleft, special_flags=pygame.BLEND_PREMULTIPLIED)
             pygame.draw.rect(s_final, (210, 220, 255, 230), panel, 2)
 
-            pad = 18
+            pad = _MENU_PAD
             y = panel.top + pad
             if self.menu_prompt:
-                pr = self.ui_font.render(self.menu_prompt, True, (235, 240, 255))
+                pr = self._render_line(self.menu_prompt, (235, 240, 255))
                 s_final.blit(pr, (panel.left + pad, y))
                 y += pr.get_height() + 10
 
-            btn_h = 34
+            btn_h = _MENU_BTN_H
             gap = 8
             self.menu_layout = []
             for idx, text in enumerate(self.menu_options):
                 r = pygame.Rect(panel.left + pad, y, panel.width - pad*2, btn_h)
                 is_hover = (idx == self.menu_hover_idx)
-                bg = (70, 100, 255, 90) if is_hover else (44, 48, 60, 160)
-                pygame.draw.rect(s_final, bg, r)
+                bg = self._menu_btn_hover if is_hover else self._menu_btn_idle
+                s_final.blit(bg, r.topleft, special_flags=pygame.BLEND_PREMULTIPLIED)
                 pygame.draw.rect(s_final, (200, 210, 255, 230), r, 1)
-                lbl = self.ui_font.render(text, True, (235, 240, 255))
+                lbl = self._render_line(text, (235, 240, 255))
                 s_final.blit(lbl, (r.left + 10, r.centery - lbl.get_height()//2))
                 self.menu_layout.append(r)
                 y += btn_h + gap
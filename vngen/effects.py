@@ -1,23 +1,63 @@
 # effects.py — time-based visual effects like screen shake
 import math
 
-def _smooth_noise(t: float, seed: int) -> float:
-    f1 = 2.0 + (seed % 7) * 0.31
-    f2 = 3.0 + (seed % 13) * 0.23
-    return math.sin(2 * math.pi * f1 * t + seed * 1.111) * 0.66 + \
-           math.sin(2 * math.pi * f2 * t + seed * 2.333) * 0.34
+try:
+    from numba import njit
+except ImportError:  # optional; shake_offset falls back to plain Python
+    njit = None
+
+TAU = 2.0 * math.pi
+
+# (TAU*f1, TAU*f2, phase1, phase2) per derived seed; constant for the life of an FX block
+_noise_params_cache: dict = {}
+_NOISE_CACHE_MAX = 256
+
+def _noise_params(seed: int):
+    p = _noise_params_cache.get(seed)
+    if p is None:
+        if len(_noise_params_cache) >= _NOISE_CACHE_MAX:
+            _noise_params_cache.clear()
+        p = _noise_params_cache[seed] = (TAU * (2.0 + (seed % 7) * 0.31),
+                                         TAU * (3.0 + (seed % 13) * 0.23),
+                                         seed * 1.111, seed * 2.333)
+    return p
+
+def _smooth_noise(t: float, seed: int, _sin=math.sin, _cache=_noise_params_cache) -> float:
+    p = _cache.get(seed) or _noise_params(seed)
+    return _sin(p[0] * t + p[2]) * 0.66 + _sin(p[1] * t + p[3]) * 0.34
 
 def shake_offset(elapsed: float, duration: float, amplitude_px: float, frequency_hz: float,
-                 decay: float = 2.5, seed: int = 0):
+                 decay: float = 2.5, seed: int = 0, _exp=math.exp, _noise=_smooth_noise):
     """Return (dx, dy) shake offset in pixels for this time."""
     if duration <= 0.0 or elapsed < 0.0 or elapsed > duration or amplitude_px <= 0.0:
         return (0, 0)
-    p = max(0.0, min(1.0, elapsed / duration))
-    env = math.exp(-decay * p)
-    t = elapsed * max(0.01, frequency_hz)
-    nx = _smooth_noise(t, seed * 92821 + 17)
-    ny = _smooth_noise(t, seed * 31337 + 53)
-    dx = int(amplitude_px * env * nx)
-    dy = int(amplitude_px * env * ny)
-    return (dx, dy)
+    amp = amplitude_px * _exp(-decay * (elapsed / duration))  # the guard keeps the ratio in [0, 1]
+    t = elapsed * (frequency_hz if frequency_hz > 0.01 else 0.01)
+    return (int(amp * _noise(t, seed * 92821 + 17)), int(amp * _noise(t, seed * 31337 + 53)))
+
+if njit is not None:
+    # numba can't use the dict cache or bound defaults, so it compiles its own copy
+    @njit(cache=True)
+    def _smooth_noise_jit(t, seed):
+        f1 = 2.0 + (seed % 7) * 0.31
+        f2 = 3.0 + (seed % 13) * 0.23
+        return math.sin(TAU * f1 * t + seed * 1.111) * 0.66 + \
+               math.sin(TAU * f2 * t + seed * 2.333) * 0.34
+
+    @njit(cache=True)
+    def _shake_offset_jit(elapsed, duration, amplitude_px, frequency_hz, decay, seed):
+        if duration <= 0.0 or elapsed < 0.0 or elapsed > duration or amplitude_px <= 0.0:
+            return (0, 0)
+        amp = amplitude_px * math.exp(-decay * (elapsed / duration))
+        t = elapsed * max(0.01, frequency_hz)
+        return (int(amp * _smooth_noise_jit(t, seed * 92821 + 17)),
+                int(amp * _smooth_noise_jit(t, seed * 31337 + 53)))
+
+    _shake_offset_jit(0.5, 1.0, 1.0, 1.0, 2.5, 0)  # compile now rather than on the first shake frame
 
+    def shake_offset(elapsed: float, duration: float, amplitude_px: float, frequency_hz: float,
+                     decay: float = 2.5, seed: int = 0):
+        """Return (dx, dy) shake offset in pixels for this time."""
+        # one argument signature, so numba only ever compiles once
+        return _shake_offset_jit(float(elapsed), float(duration), float(amplitude_px),
+                                 float(frequency_hz), float(decay), int(seed))
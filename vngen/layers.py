@@ -1,28 +1,75 @@
 # layers.py — pure data/layer helpers that compute per-frame state for GameCore
 from __future__ import annotations
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
 import pygame
-from typing import List, Tuple, Optional
+from typing import Dict, Iterator, List, Tuple, Optional
 from model import TimelineModel, Keyframe
 from vngen.config import SPRITE_DEFAULTS
 
 
+@lru_cache(maxsize=256)
+def _parse_hex(s: str) -> Tuple[int, int, int]:
+    ss = s.strip()
+    if ss.startswith("#"): ss = ss[1:]
+    if len(ss) == 3:
+        ss = ss[0]*2 + ss[1]*2 + ss[2]*2
+    try:
+        r, g, b = bytes.fromhex(ss[:6])  # short input fails the unpack, bad digits fail fromhex
+        return (r, g, b)
+    except ValueError:
+        return (0, 0, 0)
+
 class Layers:
     """Derives what should be on screen at a given playhead from the TimelineModel."""
 
     def __init__(self, model: TimelineModel, game_size: Tuple[int, int]):
         self.model = model
         self.w, self.h = game_size
+        # track -> (start times, end times, keyframes sorted by t, longest span)
+        self._interval_cache: Dict[str, Tuple[List[float], List[float], List[Keyframe], float]] = {}
+        model.tracksChanged.connect(self.invalidate)
+
+    def invalidate(self, track: str = "__all__"):
+        if track == "__all__":
+            self._interval_cache.clear()
+        else:
+            self._interval_cache.pop(track, None)
+
+    def _intervals(self, track: str):
+        c = self._interval_cache.get(track)
+        if c is None:
+            kfs = sorted(self.model.tracks.get(track, []), key=lambda k: k.t)
+            t0s = [k.t for k in kfs]
+            t1s = [k.t + self.model._eff_duration(track, k) for k in kfs]
+            span = max((b - a for a, b in zip(t0s, t1s)), default=0.0)
+            c = self._interval_cache[track] = (t0s, t1s, kfs, span)
+        return c
+
+    def _candidates(self, track: str, t: float):
+        t0s, t1s, kfs, span = self._intervals(track)
+        # only blocks starting within [t - span, t] can cover t
+        lo = bisect_left(t0s, t - span - 1e-6)
+        hi = bisect_right(t0s, t + 1e-6)
+        return t0s, t1s, kfs, lo, hi
+
+    def iter_active(self, track: str, t: float) -> Iterator[Keyframe]:
+        """Blocks covering t, in start order, without building a list."""
+        t0s, t1s, kfs, lo, hi = self._candidates(track, t)
+        for i in range(lo, hi):
+            if t0s[i] - 1e-9 <= t <= t1s[i] + 1e-9:
+                yield kfs[i]
+
+    def last_active(self, track: str, t: float) -> Optional[Keyframe]:
+        """The latest-starting block covering t (active_blocks(...)[-1]), or None."""
+        t0s, t1s, kfs, lo, hi = self._candidates(track, t)
+        for i in range(hi - 1, lo - 1, -1):
+            if t0s[i] - 1e-9 <= t <= t1s[i] + 1e-9:
+                return kfs[i]
+        return None
 
     def active_blocks(self, track: str, t: float) -> List[Keyframe]:
-        arr = self.model.tracks.get(track, [])
-        out: List[Keyframe] = []
-        for k in arr:
-            t0 = k.t
-            t1 = t0 + self.model._eff_duration(track, k)
-            if t0 - 1e-9 <= t <= t1 + 1e-9:
-                out.append(k)
-        out.sort(key=lambda k: k.t)
-        return out
+        return list(self.iter_active(track, t))
 
     def sprite_rect_opacity(self, k: Keyframe, t: Optional[float] = None) -> Tuple[pygame.Rect, float]:
         d = k.data or {}
@@ -56,23 +103,15 @@ class Layers:
         h = lerp(h1, h2)
         op = lerp(op1, op2)
 
+        gw, gh = self.w, self.h
         rect = pygame.Rect(
-            int((0.5 - w / 2 + (x - 0.5)) * self.w),
-            int((0.5 - h / 2 + (y - 0.5)) * self.h),
-            int(self.w * w),
-            int(self.h * h),
+            int((x - w * 0.5) * gw),
+            int((y - h * 0.5) * gh),
+            int(gw * w),
+            int(gh * h),
         )
         return rect, op
 
     @staticmethod
     def hex_to_rgb(s: str) -> Tuple[int, int, int]:
-        ss = s.strip()
-        if ss.startswith("#"): ss = ss[1:]
-        if len(ss) == 3:
-            ss = "".join(c*2 for c in ss)
-        try:
-            r = int(ss[0:2], 16); g = int(ss[2:4], 16); b = int(ss[4:6], 16)
-            return (r, g, b)
-        except Exception:
-            return (0, 0, 0)
-
+        return _parse_hex(s)
@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from typing import List, Optional
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class LogicAction:
     """A normalized logic action.
 
@@ -14,6 +14,12 @@ class LogicAction:
     target: Optional[str] = None
 
 
+# Argument-less commands share one prebuilt (frozen) action each.
+_CONST_ACTIONS = {cmd: LogicAction(cmd) for cmd in ("pause", "stop", "resume", "play")}
+# Commands that take a target -> the action type they produce.
+_JUMP_TYPES = {"jump": "jump", "goto": "jump", "loop": "loop"}
+_KNOWN_CMDS = frozenset(_CONST_ACTIONS) | frozenset(_JUMP_TYPES)
+
 def parse_script(script: str) -> List[LogicAction]:
     """Parse a semicolon-separated mini script into LogicAction items.
 
@@ -30,21 +36,29 @@ def parse_script(script: str) -> List[LogicAction]:
     actions: List[LogicAction] = []
     if not script:
         return actions
-    for raw in script.split(";"):
-        s = (raw or "").strip()
-        if not s:
+    i, n = 0, len(script)
+    while i < n:
+        j = script.find(";", i)
+        if j < 0:
+            j = n
+        head = script[i:j].split(None, 1)  # [cmd] or [cmd, rest]
+        i = j + 1
+        if not head:
             continue
-        parts = s.split()
-        cmd = parts[0].lower()
-        arg = " ".join(parts[1:]) if len(parts) > 1 else ""
-
-        if cmd in ("jump", "goto", "loop"):
-            actions.append(LogicAction("jump" if cmd == "goto" else cmd, arg))
-        elif cmd in ("pause", "stop", "resume", "play"):
-            actions.append(LogicAction(cmd))
-        else:
-            # ignore unknown tokens
+        cmd = head[0]
+        if cmd not in _KNOWN_CMDS:
+            cmd = cmd.lower()  # only mixed/upper case pays for a lowered copy; args keep their case
+
+        act = _CONST_ACTIONS.get(cmd)
+        if act is not None:
+            actions.append(act)
             continue
+        kind = _JUMP_TYPES.get(cmd)
+        if kind is not None:
+            # targets keep single spaces between words
+            arg = " ".join(head[1].split()) if len(head) > 1 else ""
+            actions.append(LogicAction(kind, arg))
+        # unknown tokens are ignored
     return actions
 
 
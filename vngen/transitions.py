@@ -3,10 +3,14 @@ import pygame
 from typing import Optional, Tuple
 import math
 
-def overlay_fade(surf: pygame.Surface, color: Tuple[int, int, int], progress: float):
-    """Full-screen overlay with alpha 0..1."""
+def overlay_fade(surf: pygame.Surface, color: Tuple[int, int, int], progress: float,
+                 scratch: Optional[pygame.Surface] = None):
+    """Full-screen overlay with alpha 0..1. Pass a same-sized SRCALPHA *scratch* to reuse it."""
     p = max(0.0, min(1.0, float(progress)))
-    ov = pygame.Surface(surf.get_size(), flags=pygame.SRCALPHA)
+    if scratch is not None and scratch.get_size() == surf.get_size():
+        ov = scratch
+    else:
+        ov = pygame.Surface(surf.get_size(), flags=pygame.SRCALPHA)
     ov.fill((*color, int(255 * p)))
     surf.blit(ov, (0, 0))
 
@@ -12,6 +12,20 @@ from menu_palettes import MENU_PALETTES, DEFAULT_MENU_PALETTE
 from .core import GameCore
 from .layers import Layers
 
+# palette key -> (panel, text, button, button_text, accent) QColors for the menu overlay
+_PALETTE_QCOLORS: dict = {}
+
+
+def _palette_qcolors(palette):
+    colors = _PALETTE_QCOLORS.get(palette.key)
+    if colors is None:
+        button = QtGui.QColor(*palette.button)
+        button.setAlpha(200)
+        colors = _PALETTE_QCOLORS[palette.key] = (
+            QtGui.QColor(*palette.panel), QtGui.QColor(*palette.text), button,
+            QtGui.QColor(*palette.button_text), QtGui.QColor(*palette.accent))
+    return colors
+
 
 class GameWidget(QtWidgets.QWidget):
     playheadChanged = QtCore.Signal(float)
@@ -295,15 +309,14 @@ class GameWidget(QtWidgets.QWidget):
         self._menu_kf_id = None
         self._menu_active_kf = None
 
-        dlg_blocks = self.layers.active_blocks("DIALOG", self.playhead)
-        if dlg_blocks:
-            self._apply_dialog_block(dlg_blocks[-1])
+        dlg = self.layers.last_active("DIALOG", self.playhead)
+        if dlg is not None:
+            self._apply_dialog_block(dlg)
         else:
             self.game.set_dialog("", "", 24.0, -1.0, -1.0)
 
-        music_blocks = self.layers.active_blocks("MUSIC", self.playhead)
-        if self._playing and music_blocks and not self._mute_music:
-            k = music_blocks[-1]
+        k = self.layers.last_active("MUSIC", self.playhead)
+        if self._playing and k is not None and not self._mute_music:
             offset = self.playhead - k.t
             self._start_music_block(k, offset=offset)
 
@@ -337,9 +350,8 @@ class GameWidget(QtWidgets.QWidget):
     def _ensure_music_for_current_time(self):
         if self._mute_music:
             return
-        blocks = self.layers.active_blocks("MUSIC", self.playhead)
-        if blocks:
-            k = blocks[-1]
+        k = self.layers.last_active("MUSIC", self.playhead)
+        if k is not None:
             offset = self.playhead - k.t
             self._start_music_block(k, offset=offset)
 
@@ -420,9 +432,8 @@ class GameWidget(QtWidgets.QWidget):
                 self.game.set_sprite_layers((cur_path, r_cur, op_cur), None, 0.0, 0.0)
 
         # FX (overlay/shake)
-        fx_overlap = self.layers.active_blocks("FX", t)
-        if fx_overlap:
-            fxk = fx_overlap[-1]
+        fxk = self.layers.last_active("FX", t)
+        if fxk is not None:
             d = fxk.data; mode = (d.get("mode") or "").lower()
             dur  = float(d.get("duration", 1.0))
             fa   = float(d.get("from_alpha", d.get("from", 0.0)))
@@ -441,9 +452,8 @@ class GameWidget(QtWidgets.QWidget):
             self.game.set_fx_overlay(None, 0.0, 0.0, 0.0, start_time=t, color=(0, 0, 0))
 
         # MENU: if any active, enable overlay and pause playback
-        menu_overlap = self.layers.active_blocks("MENU", t)
-        if menu_overlap:
-            mk = menu_overlap[-1]
+        mk = self.layers.last_active("MENU", t)
+        if mk is not None:
             d = mk.data or {}
             self._menu_kf_id = mk.id
             self._menu_active_kf = mk
@@ -688,14 +698,9 @@ class GameWidget(QtWidgets.QWidget):
 
     def _draw_menu_overlay(self, p: QtGui.QPainter):
         r = self.rect()
-        palette = self._menu_palette()
-        panel_color = QtGui.QColor(*palette.panel)
+        panel_rgb, text_color, button_color, button_text_color, accent_color = _palette_qcolors(self._menu_palette())
+        panel_color = QtGui.QColor(panel_rgb)  # alpha follows the keyframe's panel opacity
         panel_color.setAlpha(int(max(0.1, min(1.0, self._menu_panel_opacity)) * 255))
-        text_color = QtGui.QColor(*palette.text)
-        button_color = QtGui.QColor(*palette.button)
-        button_color.setAlpha(200)
-        button_text_color = QtGui.QColor(*palette.button_text)
-        accent_color = QtGui.QColor(*palette.accent)
 
         if self._menu_background_pixmap:
             p.save()
@@ -768,8 +773,8 @@ class GameWidget(QtWidgets.QWidget):
     def _refresh_active_menu_from_model(self):
         """Re-read the active MENU block for current playhead and rebuild prompt/options/rects."""
         t = self.playhead
-        menu_overlap = self.layers.active_blocks("MENU", t)
-        if not menu_overlap:
+        mk = self.layers.last_active("MENU", t)
+        if mk is None:
             self._menu_active = False
             self._menu_rects = []
             self._menu_btn_text = []
@@ -780,7 +785,6 @@ class GameWidget(QtWidgets.QWidget):
             self._menu_background_path = ""
             self._menu_background_rel = ""
             return
-        mk = menu_overlap[-1]
         self._menu_kf_id = mk.id
         self._menu_active_kf = mk
         d = mk.data or {}
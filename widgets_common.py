@@ -0,0 +1,113 @@
+# widgets_common.py — Qt pieces shared by the sidebar editor and the timeline dialogs
+from __future__ import annotations
+from typing import List, Optional
+from PySide6 import QtCore, QtGui
+
+_color_validator: Optional[QtGui.QRegularExpressionValidator] = None
+
+
+def color_validator() -> QtGui.QValidator:
+    """Validator shared by every hex colour field, built on first use.
+
+    Accepts #rgb, #rrggbb, or #rrggbbaa as older projects store it
+    (Layers.hex_to_rgb reads the first six digits and ignores the alpha).
+    """
+    global _color_validator
+    if _color_validator is None:
+        _color_validator = QtGui.QRegularExpressionValidator(
+            QtCore.QRegularExpression(r"^#?(?:[0-9a-fA-F]{3}|[0-9a-fA-F]{6}|[0-9a-fA-F]{8})$"))
+    return _color_validator
+
+
+class MenuOptionsModel(QtCore.QAbstractTableModel):
+    """Editable MENU options kept as plain rows of strings, one column per header."""
+
+    HEADERS = ("Text", "Target (label or time)", "Script Asset", "Inline Script")
+
+    def __init__(self, parent=None, headers=None):
+        super().__init__(parent)
+        self.headers = tuple(headers or self.HEADERS)
+        self._rows: List[List[str]] = []
+
+    def rowCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.headers)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if index.isValid() and role in (QtCore.Qt.DisplayRole, QtCore.Qt.EditRole):
+            return self._rows[index.row()][index.column()]
+        return None
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole) -> bool:
+        if not index.isValid() or role != QtCore.Qt.EditRole:
+            return False
+        self._rows[index.row()][index.column()] = str(value)
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+        return QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsEditable
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return self.headers[section]
+        return None
+
+    def rows(self) -> List[List[str]]:
+        return self._rows
+
+    def set_rows(self, rows):
+        # overwrite rows in place and only insert/remove the difference, so reloading
+        # a menu doesn't reset the view
+        new = [list(r) for r in rows]
+        n, old_n = len(new), len(self._rows)
+        if n < old_n:
+            self.removeRows(n, old_n - n)
+        elif n > old_n:
+            self.beginInsertRows(QtCore.QModelIndex(), old_n, n - 1)
+            self._rows.extend(new[old_n:])
+            self.endInsertRows()
+        common = min(n, old_n)
+        if common:
+            self._rows[:common] = new[:common]
+            self.dataChanged.emit(self.index(0, 0), self.index(common - 1, len(self.headers) - 1))
+
+    def append_row(self, values) -> int:
+        r = len(self._rows)
+        self.beginInsertRows(QtCore.QModelIndex(), r, r)
+        self._rows.append(list(values))
+        self.endInsertRows()
+        return r
+
+    def swap_rows(self, a: int, b: int):
+        rows = self._rows
+        rows[a], rows[b] = rows[b], rows[a]
+        lo, hi = min(a, b), max(a, b)
+        self.dataChanged.emit(self.index(lo, 0), self.index(hi, len(self.headers) - 1))
+
+    def removeRows(self, row: int, count: int, parent=QtCore.QModelIndex()) -> bool:
+        if parent.isValid() or row < 0 or count < 1 or row + count > len(self._rows):
+            return False
+        self.beginRemoveRows(parent, row, row + count - 1)
+        del self._rows[row:row + count]
+        self.endRemoveRows()
+        return True
+
+    def moveRows(self, src_parent, src: int, count: int, dst_parent, dst: int) -> bool:
+        n = len(self._rows)
+        if src_parent.isValid() or dst_parent.isValid() or count < 1:
+            return False
+        if src < 0 or src + count > n or not (0 <= dst <= n) or src <= dst <= src + count:
+            return False
+        if not self.beginMoveRows(src_parent, src, src + count - 1, dst_parent, dst):
+            return False
+        chunk = self._rows[src:src + count]
+        del self._rows[src:src + count]
+        at = dst - count if dst > src else dst
+        self._rows[at:at] = chunk
+        self.endMoveRows()
+        return True